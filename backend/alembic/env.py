@@ -0,0 +1,63 @@
+# backend/alembic/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, DATABASE_URL, engine
+import app.models_program  # noqa: F401  (register tables on Base.metadata)
+import app.models_user  # noqa: F401
+from app.search import SEARCH_OBJECT_PREFIX
+
+config = context.config
+
+if config.config_file_name is not None and not config.attributes.get("skip_logging"):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Dialect-specific search objects (FTS5 table, GIN indexes) live only in migrations
+    return not (name or "").startswith(SEARCH_OBJECT_PREFIX)
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of applying it (`alembic upgrade head --sql`)."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    with engine.connect() as connection:
+        _run(connection)
+
+
+def _run(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite can't ALTER most constraints in place; batch mode rebuilds the table
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,139 @@
+"""baseline schema
+
+Creates the original tables. Databases that predate migrations were built
+with Base.metadata.create_all, so any table that already exists is left
+untouched and the database is simply adopted at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUMS = {
+    "statusenum": ("draft", "scheduled", "published", "archived"),
+    "contenttypeenum": ("video", "article"),
+    "assetvariantenum": ("portrait", "landscape", "square", "banner"),
+    "assettypeenum": ("poster", "thumbnail", "subtitle"),
+}
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _enum(name):
+    if _is_postgres():
+        # Types are created once up front; several tables share them
+        return postgresql.ENUM(*ENUMS[name], name=name, create_type=False)
+    return sa.Enum(*ENUMS[name], name=name)
+
+
+def _array():
+    return postgresql.ARRAY(sa.String) if _is_postgres() else sa.JSON
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if _is_postgres():
+        for name, values in ENUMS.items():
+            postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+
+    if "programs" not in existing:
+        op.create_table(
+            "programs",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("title", sa.String, nullable=False),
+            sa.Column("description", sa.Text, nullable=True),
+            sa.Column("language_primary", sa.String, nullable=False),
+            sa.Column("languages_available", _array()),
+            sa.Column("status", _enum("statusenum")),
+            sa.Column("published_at", sa.DateTime, nullable=True),
+            sa.Column("created_at", sa.DateTime),
+            sa.Column("updated_at", sa.DateTime),
+            sa.Column("poster_assets_by_language", sa.JSON),
+        )
+
+    if "terms" not in existing:
+        op.create_table(
+            "terms",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("program_id", sa.String, sa.ForeignKey("programs.id"), nullable=False),
+            sa.Column("term_number", sa.Integer, nullable=False),
+            sa.Column("title", sa.String, nullable=True),
+            sa.Column("created_at", sa.DateTime),
+            sqlite_autoincrement=True,
+        )
+
+    if "lessons" not in existing:
+        op.create_table(
+            "lessons",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("program_id", sa.String, sa.ForeignKey("programs.id"), nullable=False),
+            sa.Column("term_id", sa.String, sa.ForeignKey("terms.id"), nullable=True),
+            sa.Column("lesson_number", sa.Integer, nullable=False),
+            sa.Column("title", sa.String, nullable=False),
+            sa.Column("content_type", _enum("contenttypeenum")),
+            sa.Column("duration_ms", sa.Integer, nullable=True),
+            sa.Column("is_paid", sa.Boolean),
+            sa.Column("content_language_primary", sa.String, nullable=False),
+            sa.Column("content_languages_available", _array()),
+            sa.Column("content_urls_by_language", sa.JSON),
+            sa.Column("subtitle_languages", _array()),
+            sa.Column("subtitle_urls_by_language", sa.JSON),
+            sa.Column("assets", sa.JSON),
+            sa.Column("status", _enum("statusenum")),
+            sa.Column("publish_at", sa.DateTime, nullable=True),
+            sa.Column("published_at", sa.DateTime, nullable=True),
+            sa.Column("created_at", sa.DateTime),
+            sa.Column("updated_at", sa.DateTime),
+            sa.Column("thumbnail_assets_by_language", sa.JSON, nullable=True),
+        )
+
+    if "program_assets" not in existing:
+        op.create_table(
+            "program_assets",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("program_id", sa.String, sa.ForeignKey("programs.id"), nullable=False),
+            sa.Column("language", sa.String, nullable=False),
+            sa.Column("variant", _enum("assetvariantenum"), nullable=False),
+            sa.Column("asset_type", _enum("assettypeenum"), nullable=False),
+            sa.Column("url", sa.String, nullable=False),
+        )
+
+    if "lesson_assets" not in existing:
+        op.create_table(
+            "lesson_assets",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("lesson_id", sa.String, sa.ForeignKey("lessons.id"), nullable=False),
+            sa.Column("language", sa.String, nullable=False),
+            sa.Column("variant", _enum("assetvariantenum"), nullable=False),
+            sa.Column("asset_type", _enum("assettypeenum"), nullable=False),
+            sa.Column("url", sa.String, nullable=False),
+        )
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String, primary_key=True),
+            sa.Column("username", sa.String, nullable=False, unique=True),
+            sa.Column("password_hash", sa.String, nullable=False),
+            sa.Column("role", sa.String, nullable=False),
+        )
+
+
+def downgrade():
+    for table in ("users", "lesson_assets", "program_assets", "lessons", "terms", "programs"):
+        op.drop_table(table)
+    if _is_postgres():
+        for name in ENUMS:
+            postgresql.ENUM(name=name).drop(op.get_bind(), checkfirst=True)
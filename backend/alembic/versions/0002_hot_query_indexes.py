@@ -0,0 +1,50 @@
+"""composite indexes for the hot query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SCHEDULED_ONLY = sa.text("status = 'scheduled'")
+
+
+def upgrade():
+    # if_not_exists: databases built with create_all from the current models already have them
+    op.create_index(
+        "ix_programs_status_published_at", "programs", ["status", "published_at", "id"], if_not_exists=True
+    )
+    op.create_index("ix_programs_created_at", "programs", ["created_at", "id"], if_not_exists=True)
+    op.create_index("ix_terms_program_id", "terms", ["program_id"], if_not_exists=True)
+    op.create_index("ix_lessons_status_publish_at", "lessons", ["status", "publish_at"], if_not_exists=True)
+    op.create_index(
+        "ix_lessons_scheduled_publish_at",
+        "lessons",
+        ["publish_at"],
+        postgresql_where=SCHEDULED_ONLY,
+        sqlite_where=SCHEDULED_ONLY,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_lessons_program_status_number",
+        "lessons",
+        ["program_id", "status", "lesson_number"],
+        if_not_exists=True,
+    )
+    op.create_index("ix_lessons_term_id", "lessons", ["term_id"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_lessons_term_id", table_name="lessons")
+    op.drop_index("ix_lessons_program_status_number", table_name="lessons")
+    op.drop_index("ix_lessons_scheduled_publish_at", table_name="lessons")
+    op.drop_index("ix_lessons_status_publish_at", table_name="lessons")
+    op.drop_index("ix_terms_program_id", table_name="terms")
+    op.drop_index("ix_programs_created_at", table_name="programs")
+    op.drop_index("ix_programs_status_published_at", table_name="programs")
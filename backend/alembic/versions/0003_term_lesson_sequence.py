@@ -0,0 +1,58 @@
+"""per-term lesson number sequence and unique (term_id, lesson_number)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "terms",
+        sa.Column("next_lesson_number", sa.Integer, nullable=False, server_default="1"),
+    )
+    bind = op.get_bind()
+
+    # Lessons numbered by the old count()+1 scheme may collide; move the later
+    # duplicates past the term's current maximum before enforcing uniqueness.
+    duplicates = bind.execute(sa.text(
+        "SELECT term_id, lesson_number FROM lessons WHERE term_id IS NOT NULL "
+        "GROUP BY term_id, lesson_number HAVING COUNT(*) > 1"
+    )).all()
+    for term_id, lesson_number in duplicates:
+        next_number = bind.execute(
+            sa.text("SELECT MAX(lesson_number) FROM lessons WHERE term_id = :t"), {"t": term_id}
+        ).scalar() + 1
+        ids = bind.execute(
+            sa.text(
+                "SELECT id FROM lessons WHERE term_id = :t AND lesson_number = :n ORDER BY created_at, id"
+            ),
+            {"t": term_id, "n": lesson_number},
+        ).scalars().all()
+        for lesson_id in ids[1:]:
+            bind.execute(
+                sa.text("UPDATE lessons SET lesson_number = :n WHERE id = :id"),
+                {"n": next_number, "id": lesson_id},
+            )
+            next_number += 1
+
+    bind.execute(sa.text(
+        "UPDATE terms SET next_lesson_number = COALESCE("
+        "(SELECT MAX(lesson_number) FROM lessons WHERE lessons.term_id = terms.id), 0) + 1"
+    ))
+    op.create_index(
+        "uq_lessons_term_lesson_number", "lessons", ["term_id", "lesson_number"], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index("uq_lessons_term_lesson_number", table_name="lessons")
+    with op.batch_alter_table("terms") as batch_op:
+        batch_op.drop_column("next_lesson_number")
@@ -0,0 +1,52 @@
+"""catalog_entries denormalized read model
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+The table starts empty; the app fills it on startup (or run
+`python -m app.catalog_projection`).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_entries",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("program_id", sa.String, nullable=False),
+        sa.Column("entry_id", sa.String, nullable=False),
+        sa.Column("entry_type", sa.String, nullable=False),
+        sa.Column("language", sa.String, nullable=False),
+        sa.Column("is_primary", sa.Boolean, nullable=False),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("published_at", sa.DateTime, nullable=True),
+        sa.Column("payload", sa.JSON, nullable=False),
+        sa.Column("refreshed_at", sa.DateTime, nullable=True),
+    )
+    op.create_index(
+        "uq_catalog_entries_entry_language", "catalog_entries", ["entry_id", "language"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_catalog_entries_listing", "catalog_entries",
+        ["entry_type", "language", "published_at", "program_id"],
+    )
+    op.create_index(
+        "ix_catalog_entries_primary_listing", "catalog_entries",
+        ["entry_type", "is_primary", "published_at", "program_id"],
+    )
+    op.create_index(
+        "ix_catalog_entries_program", "catalog_entries",
+        ["program_id", "language", "position"],
+    )
+
+
+def downgrade():
+    op.drop_table("catalog_entries")
@@ -0,0 +1,23 @@
+"""clear catalog_entries so they are re-projected with language-resolved payloads
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Payloads no longer carry the per-language JSON blobs. The app rebuilds an
+empty projection on startup (or run `python -m app.catalog_projection`).
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM catalog_entries")
+
+
+def downgrade():
+    op.execute("DELETE FROM catalog_entries")
@@ -0,0 +1,53 @@
+"""full-text search: tsvector GIN indexes (PostgreSQL) / FTS5 table (SQLite)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+The index expressions must stay identical to app.search.program_document()
+and lesson_document(), or the planner will not use them.
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+PROGRAM_DOCUMENT = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+LESSON_DOCUMENT = "to_tsvector('simple', coalesce(title, ''))"
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "entity_type UNINDEXED, entity_id UNINDEXED, program_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO search_index (entity_type, entity_id, program_id, title, body) "
+            "SELECT 'program', id, id, title, coalesce(description, '') FROM programs "
+            "WHERE status = 'published'"
+        )
+        op.execute(
+            "INSERT INTO search_index (entity_type, entity_id, program_id, title, body) "
+            "SELECT 'lesson', l.id, l.program_id, l.title, '' FROM lessons l "
+            "JOIN programs p ON p.id = l.program_id "
+            "WHERE l.status = 'published' AND p.status = 'published'"
+        )
+    else:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS search_programs_document ON programs USING gin ({PROGRAM_DOCUMENT})"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS search_lessons_document ON lessons USING gin ({LESSON_DOCUMENT})"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_index")
+    else:
+        op.execute("DROP INDEX IF EXISTS search_lessons_document")
+        op.execute("DROP INDEX IF EXISTS search_programs_document")
@@ -0,0 +1,98 @@
+"""asset tables as the single source of artwork: dedupe, backfill JSON blobs, unique indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Blob entries are copied only where no row exists for the same
+(owner, language, asset_type, variant), so existing rows keep precedence;
+thumbnail_assets_by_language wins over the older Lesson.assets. The blob
+columns are left in place but no longer read. catalog_entries is cleared so
+the app re-projects it from the tables on startup.
+"""
+import uuid
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+VARIANTS = {"portrait", "landscape", "square", "banner"}
+INSERT_CHUNK_SIZE = 1000
+
+programs = sa.table("programs", sa.column("id"), sa.column("poster_assets_by_language", sa.JSON))
+lessons = sa.table(
+    "lessons", sa.column("id"), sa.column("assets", sa.JSON),
+    sa.column("thumbnail_assets_by_language", sa.JSON),
+)
+ASSET_TABLES = {
+    # table: (owner column, source table, blob columns in precedence order, asset type)
+    "program_assets": ("program_id", programs, ("poster_assets_by_language",), "poster"),
+    "lesson_assets": ("lesson_id", lessons, ("thumbnail_assets_by_language", "assets"), "thumbnail"),
+}
+
+
+def _asset_table(name, owner):
+    return sa.table(
+        name, sa.column("id"), sa.column(owner), sa.column("language"),
+        sa.column("variant"), sa.column("asset_type"), sa.column("url"),
+    )
+
+
+def _dedupe(name, owner):
+    op.execute(
+        f"DELETE FROM {name} WHERE id NOT IN ("
+        f"SELECT MIN(id) FROM {name} GROUP BY {owner}, language, asset_type, variant)"
+    )
+
+
+def _backfill(conn, name, owner, source, blob_columns, asset_type):
+    table = _asset_table(name, owner)
+    seen = {
+        (row[0], row[1], row[2], row[3])
+        for row in conn.execute(sa.select(
+            table.c[owner], table.c.language, table.c.asset_type, table.c.variant
+        ))
+    }
+    rows = []
+    result = conn.execution_options(stream_results=True).execute(
+        sa.select(source.c.id, *(source.c[column] for column in blob_columns))
+    )
+    for record in result:
+        for blob in record[1:]:
+            if not isinstance(blob, dict):
+                continue
+            for language, urls in blob.items():
+                if not isinstance(urls, dict):
+                    continue
+                for variant, url in urls.items():
+                    key = (record[0], language, asset_type, variant)
+                    if variant not in VARIANTS or not isinstance(url, str) or not url or key in seen:
+                        continue
+                    seen.add(key)
+                    rows.append({
+                        "id": str(uuid.uuid4()), owner: record[0], "language": language,
+                        "variant": variant, "asset_type": asset_type, "url": url,
+                    })
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        conn.execute(table.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def upgrade():
+    conn = op.get_bind()
+    for name, (owner, source, blob_columns, asset_type) in ASSET_TABLES.items():
+        _dedupe(name, owner)
+        _backfill(conn, name, owner, source, blob_columns, asset_type)
+        op.create_index(
+            f"uq_{name}_owner_language_type_variant", name,
+            [owner, "language", "asset_type", "variant"], unique=True,
+        )
+    op.execute("DELETE FROM catalog_entries")
+
+
+def downgrade():
+    for name in ASSET_TABLES:
+        op.drop_index(f"uq_{name}_owner_language_type_variant", table_name=name)
+    op.execute("DELETE FROM catalog_entries")
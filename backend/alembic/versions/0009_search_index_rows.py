@@ -0,0 +1,36 @@
+"""search_index_rows: indexed entity/program -> FTS rowid map (SQLite)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+program_id is an UNINDEXED column of the FTS5 table, so deleting a program's
+rows by it scanned the whole index. Rows are now found through this table
+and deleted by rowid. PostgreSQL has nothing to migrate.
+"""
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS search_index_rows ("
+        "fts_rowid INTEGER PRIMARY KEY, entity_id VARCHAR NOT NULL, program_id VARCHAR NOT NULL)"
+    )
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS search_index_rows_entity ON search_index_rows (entity_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS search_index_rows_program ON search_index_rows (program_id)")
+    op.execute(
+        "INSERT INTO search_index_rows (fts_rowid, entity_id, program_id) "
+        "SELECT rowid, entity_id, program_id FROM search_index"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_index_rows")
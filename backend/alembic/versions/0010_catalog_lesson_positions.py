@@ -0,0 +1,24 @@
+"""clear catalog_entries so lesson rows are re-projected positioned by lesson number
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+Lessons are now re-projected one at a time, which needs positions that don't
+depend on their siblings. The app rebuilds an empty projection on startup
+(or run `python -m app.catalog_projection`).
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM catalog_entries")
+
+
+def downgrade():
+    op.execute("DELETE FROM catalog_entries")
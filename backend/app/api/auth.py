@@ -1,25 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.auth import issue_token, revoke_tokens, verify_and_update_password
+from app.database import get_async_db, run_db
+from app.deps import get_current_user, require_admin
+from app.models_user import User
 
 router = APIRouter(tags=["Auth"])
 
-# Dummy login data
-USERS = {
-    "admin@cms.com": {"password": "admin123", "role": "admin"},
-    "editor@cms.com": {"password": "editor123", "role": "editor"},
-}
-
 class LoginRequest(BaseModel):
     email: str
     password: str
 
 @router.post("/login")
-def login(data: LoginRequest):
-    user = USERS.get(data.email)
-    if not user or user["password"] != data.password:
+async def login(data: LoginRequest, db=Depends(get_async_db)):
+    user = await run_db(
+        db, lambda s: s.execute(select(User).where(User.username == data.email)).scalar_one_or_none()
+    )
+    valid, new_hash = await verify_and_update_password(data.password, user.password_hash if user else None)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored with an older cost factor; upgrade it now that we have the plaintext
+        user.password_hash = new_hash
+        await run_db(db, Session.commit)
 
+    token = issue_token(user)
     return {
-        "token": f"fake-token-for-{data.email}",
-        "role": user["role"],
+        "access_token": token,
+        "token_type": "bearer",
+        "token": token,  # older frontend builds read this key
+        "role": user.role,
     }
+
+@router.post("/logout")
+async def logout(db=Depends(get_async_db), user=Depends(get_current_user)):
+    """Revoke every token of the current user (all devices)."""
+    await run_db(db, revoke_tokens, user["id"])
+    return {"message": "Logged out"}
+
+@router.post("/users/{user_id}/revoke")
+async def revoke_user_tokens(user_id: str, db=Depends(get_async_db), user=Depends(require_admin)):
+    return await run_db(db, _revoke_user_tokens, user_id)
+
+def _revoke_user_tokens(db: Session, user_id: str):
+    if not db.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    revoke_tokens(db, user_id)
+    return {"message": "Tokens revoked"}
@@ -1,43 +1,226 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models_program import Program, Lesson, StatusEnum
-from app.api.cms import require_admin_or_editor
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, aliased
+from app.cache import CATALOG_LISTING, catalog_cache
+from app.catalog_projection import PROGRAM, PROGRAM_FIELDS
+from app.database import get_async_db, run_db
+from app.models_program import CatalogEntry
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_order, keyset_page, page_headers
+from app.responses import ORJSONResponse
+from app.search import search
+from app.streaming import stream_rows
 router = APIRouter(tags=["Catalog"])
 
+
+# --- Conditional request helpers ---
+def _version(*parts):
+    """Build (etag, last_modified) from the aggregates that define a payload."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    stamps = [p for p in parts if hasattr(p, "tzinfo")]
+    last_modified = max(stamps) if stamps else None
+    return f'"{digest}"', last_modified
+
+
+def _language_filter(lang):
+    """catalog_entries rows in `lang`, or in the primary language of programs not offered in it."""
+    if not lang:
+        return CatalogEntry.is_primary.is_(True)
+    offered = aliased(CatalogEntry)
+    return or_(
+        CatalogEntry.language == lang,
+        and_(
+            CatalogEntry.is_primary.is_(True),
+            ~select(offered.id)
+            .where(offered.entry_id == CatalogEntry.program_id, offered.language == lang)
+            .exists(),
+        ),
+    )
+
+
+def _listing_version(db, scope, page_params=()):
+    row = db.execute(
+        select(
+            func.count(CatalogEntry.id),
+            func.max(CatalogEntry.refreshed_at),
+            func.max(CatalogEntry.published_at),
+        ).where(*scope)
+    ).one()
+    return _version(*row, page_params)
+
+
+def _listing_fields(fields):
+    """Payload keys kept for `fields=a,b,c`; None keeps everything."""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROGRAM_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _not_modified(request: Request, etag, last_modified):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def _conditional_response(request: Request, etag, last_modified, body=None, extra_headers=None):
+    """Return 304 when the client's copy is current, else the JSON body with validators."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **(extra_headers or {})}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(body, headers=headers)
+
+
 @router.get("/programs")
-def get_catalog_programs(db: Session = Depends(get_db)):
-    programs = (
-        db.query(Program)
-        .filter(Program.status == StatusEnum.published)
-        .order_by(Program.published_at.desc())
-        .all()
+async def get_catalog_programs(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    include_total: bool = True,
+    lang: str | None = None,
+    stream: str | None = Query(None, pattern="^(ndjson|json)$"),
+    db=Depends(get_async_db),
+):
+    """Published programs, newest first.
+
+    Paginated on (published_at, id): follow the X-Next-Cursor header with
+    ?cursor=. `fields=` limits the keys returned, and include_total=false
+    skips the X-Total-Count scan. `lang=` picks the language URLs and assets
+    are resolved for; programs not offered in it (and the default) use their
+    primary language.
+
+    stream=ndjson (one program per line) or stream=json (one array) sends
+    every program from `cursor` on instead of a page, read from a
+    server-side cursor; those responses are not cached.
+    """
+    if stream:
+        return _stream_catalog_programs(cursor, fields, lang, stream)
+    page_params = (cursor, limit, fields, include_total, lang)
+    cache_key = (CATALOG_LISTING, *page_params)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return _conditional_response(request, *cached)
+    return await run_db(db, _get_catalog_programs, request, cache_key, page_params)
+
+
+def _get_catalog_programs(db: Session, request: Request, cache_key, page_params):
+    generation = catalog_cache.generation  # before reading, see TTLCache
+    cursor, limit, fields, include_total, lang = page_params
+    names = _listing_fields(fields)
+    scope = (CatalogEntry.entry_type == PROGRAM, _language_filter(lang))
+
+    # Answer revalidations from the version token alone, before loading any rows
+    etag, last_modified = _listing_version(db, scope, page_params)
+    if _not_modified(request, etag, last_modified):
+        return _conditional_response(request, etag, last_modified)
+
+    rows, next_cursor, total = keyset_page(
+        db,
+        select(CatalogEntry.id).where(*scope),
+        [CatalogEntry.payload],
+        CatalogEntry.published_at,
+        CatalogEntry.program_id,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total,
     )
-    return programs
+    payload = [row["payload"] for row in rows]
+    if names is not None:
+        payload = [{name: entry.get(name) for name in names} for entry in payload]
+    headers = page_headers(next_cursor, total)
+    catalog_cache.set(cache_key, (etag, last_modified, payload, headers), generation)
+    return _conditional_response(request, etag, last_modified, payload, headers)
 
-@router.get("/programs/{program_id}")
-def get_program_lessons(program_id: str, db: Session = Depends(get_db)):
-    program = (
-        db.query(Program)
-        .filter(Program.id == program_id, Program.status == StatusEnum.published)
-        .first()
+def _stream_catalog_programs(cursor, fields, lang, mode):
+    names = _listing_fields(fields)
+    stmt = keyset_order(
+        select(CatalogEntry.payload).where(CatalogEntry.entry_type == PROGRAM, _language_filter(lang)),
+        CatalogEntry.published_at,
+        CatalogEntry.program_id,
+        cursor,
     )
-    if not program:
+    if names is None:
+        return stream_rows(stmt, lambda row: row.payload, mode)
+    return stream_rows(stmt, lambda row: {name: row.payload.get(name) for name in names}, mode)
+
+
+@router.get("/programs/{program_id}")
+async def get_program_lessons(
+    program_id: str, request: Request, lang: str | None = None, db=Depends(get_async_db)
+):
+    cache_key = (program_id, lang)
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return _conditional_response(request, *cached)
+    return await run_db(db, _get_program_lessons, request, cache_key, program_id, lang)
+
+
+def _get_program_lessons(db: Session, request: Request, cache_key, program_id: str, lang=None):
+    generation = catalog_cache.generation  # before reading, see TTLCache
+    # The program row (position 0) and its lessons, in one indexed range read;
+    # the primary-language rows come along as the fallback when `lang` is missing
+    language = CatalogEntry.is_primary.is_(True)
+    if lang:
+        language = or_(CatalogEntry.language == lang, language)
+    rows = db.execute(
+        select(
+            CatalogEntry.entry_type, CatalogEntry.language, CatalogEntry.payload, CatalogEntry.refreshed_at
+        )
+        .where(CatalogEntry.program_id == program_id, language)
+        .order_by(CatalogEntry.position, CatalogEntry.entry_id)
+    ).all()
+    entries = [row for row in rows if row.language == lang] or [
+        row for row in rows if row.language != lang
+    ]
+    if not entries or entries[0].entry_type != PROGRAM:
         return {"error": "Program not found or unpublished"}
-    lessons = (
-        db.query(Lesson)
-        .filter(Lesson.program_id == program_id, Lesson.status == StatusEnum.published)
-        .order_by(Lesson.lesson_number)
-        .all()
-    )
-    return {"program": program, "lessons": lessons or []}
+
+    etag, last_modified = _version(len(entries), max(e.refreshed_at for e in entries), lang)
+    if _not_modified(request, etag, last_modified):
+        return _conditional_response(request, etag, last_modified)
+
+    payload = {"program": entries[0].payload, "lessons": [e.payload for e in entries[1:]]}
+    catalog_cache.set(cache_key, (etag, last_modified, payload), generation)
+    return _conditional_response(request, etag, last_modified, payload)
+
+
+@router.get("/search")
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db=Depends(get_async_db),
+):
+    """Published programs and lessons matching `q`, best match first.
+
+    Follow the X-Next-Offset header with ?offset= for the next page.
+    """
+    return await run_db(db, _search_catalog, q, limit, offset)
+
+
+def _search_catalog(db: Session, q, limit, offset):
+    results = search(db, q, limit + 1, offset)
+    headers = {"X-Next-Offset": str(offset + limit)} if len(results) > limit else {}
+    return ORJSONResponse(results[:limit], headers=headers)
 
 
-@router.post("/lessons/{lesson_id}/archive")
-def archive_lesson(lesson_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
-    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
-    if not lesson:
-        raise HTTPException(status_code=404, detail="Lesson not found")
-    lesson.status = StatusEnum.archived
-    db.commit()
-    return {"message": "Lesson archived", "lesson": lesson}
+@router.get("/cache/stats")
+async def get_catalog_cache_stats():
+    return catalog_cache.stats()
@@ -1,33 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from sqlalchemy import and_
-from app.database import get_db
-from app.models_program import Program, Lesson, StatusEnum, Term
-from app.worker import run_scheduled_publisher
+from typing import Literal
+from sqlalchemy import and_, select
+from sqlalchemy.orm import selectinload
+from app.assets import load_program_assets, missing_thumbnails, resolve_assets
+from app.cache import invalidate_catalog
+from app.database import get_async_db, run_db
+from app.deps import require_admin_or_editor
+from app.lesson_batch import apply_batch, schedule_time
+from app.lesson_import import BULK_IMPORT_BATCH_SIZE, LessonImporter
+from app.catalog_projection import refresh_lessons, refresh_programs
+from app.models_program import AssetTypeEnum, Program, Lesson, StatusEnum, Term, reserve_lesson_numbers
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_order, keyset_page, page_headers, projected_columns,
+)
+from app.responses import ORJSONResponse
+from app.schemas import (
+    BulkImportResponse, LessonBatchResponse, LessonMessageResponse, LessonOut, MessageResponse,
+    ProgramDetailsResponse, ProgramMessageResponse, ProgramOut,
+)
+from app.streaming import stream_rows
+from app.utils.json_stream import iter_json_rows
+from app.worker import notify_schedule_changed
 
 router = APIRouter(tags=["CMS"])
 
-# --- Dummy auth for now (replaceable with JWT later) ---
-def get_current_user():
-    # default to admin for local testing
-    return {"role": "admin"}
-
-def require_admin_or_editor(user=Depends(get_current_user)):
-    if user["role"] not in ["admin", "editor"]:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    return user
-
 
 # ================= PROGRAMS =================
 @router.get("/programs")
-def list_programs(db: Session = Depends(get_db)):
-    programs = db.query(Program).all()
-    return programs
+async def list_programs(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
+    include_total: bool = True,
+    stream: str | None = Query(None, pattern="^(ndjson|json)$"),
+    db=Depends(get_async_db),
+):
+    """All programs, newest first, paginated on (created_at, id).
+
+    Drafts have no published_at, so the CMS listing keys on created_at.
+    stream=ndjson|json sends every program from `cursor` on instead of a page.
+    """
+    if stream:
+        stmt = keyset_order(select(*projected_columns(Program, fields)), Program.created_at, Program.id, cursor)
+        return stream_rows(stmt, lambda row: dict(row._mapping), stream)
+    return await run_db(db, _list_programs, cursor, limit, fields, include_total)
+
+
+def _list_programs(db: Session, cursor, limit, fields, include_total):
+    programs, next_cursor, total = keyset_page(
+        db,
+        select(Program.id),
+        projected_columns(Program, fields),
+        Program.created_at,
+        Program.id,
+        cursor=cursor,
+        limit=limit,
+        include_total=include_total,
+    )
+    return ORJSONResponse(programs, headers=page_headers(next_cursor, total))
+
 
+@router.post("/programs", response_model=ProgramOut)
+async def create_program(data: dict, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _create_program, data)
 
-@router.post("/programs")
-def create_program(data: dict, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+
+def _create_program(db: Session, data: dict):
     if not data.get("title"):
         raise HTTPException(status_code=400, detail="Program title required")
 
@@ -44,53 +85,86 @@ def create_program(data: dict, db: Session = Depends(get_db), user=Depends(requi
     return new_program
 
 
-@router.post("/programs/{program_id}/publish")
-def publish_program(program_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+@router.post("/programs/{program_id}/publish", response_model=ProgramMessageResponse)
+async def publish_program(program_id: str, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _publish_program, program_id)
+
+
+def _publish_program(db: Session, program_id: str):
     program = db.query(Program).filter(Program.id == program_id).first()
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
 
     # Validate media requirements
-    validate_program_assets(program)
+    validate_program_assets(db, program)
 
     program.status = StatusEnum.published
     program.published_at = datetime.utcnow()
+    refresh_programs(db, [program.id])
     db.commit()
+    invalidate_catalog([program.id], listing=True)
     db.refresh(program)
     ...
 
     return {"message": "Program published", "program": program}
 
 
-@router.delete("/programs/{program_id}")
-def delete_program(program_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+@router.delete("/programs/{program_id}", response_model=MessageResponse)
+async def delete_program(program_id: str, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _delete_program, program_id)
+
+
+def _delete_program(db: Session, program_id: str):
     program = db.query(Program).filter(Program.id == program_id).first()
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
     db.delete(program)
+    refresh_programs(db, [program_id])
     db.commit()
+    invalidate_catalog([program_id], listing=True)
     return {"message": "Program deleted"}
 
 
-@router.get("/programs/{program_id}")
-def get_program_details(program_id: str, db: Session = Depends(get_db)):
-    program = db.query(Program).filter(Program.id == program_id).first()
+@router.get("/programs/{program_id}", response_model=ProgramDetailsResponse)
+async def get_program_details(program_id: str, db=Depends(get_async_db)):
+    """Program with its assets and a term -> lessons tree, in a fixed 5 queries."""
+    return await run_db(db, _get_program_details, program_id)
+
+
+def _get_program_details(db: Session, program_id: str):
+    program = (
+        db.query(Program)
+        .options(
+            selectinload(Program.program_assets),
+            selectinload(Program.terms)
+            .selectinload(Term.lessons)
+            .selectinload(Lesson.lesson_assets),
+        )
+        .filter(Program.id == program_id)
+        .first()
+    )
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
 
-    terms = db.query(Term).filter(Term.program_id == program.id).all()
-    lessons = db.query(Lesson).join(Term).filter(Term.program_id == program.id).all()
-    return {"program": program, "terms": terms, "lessons": lessons}
+    return ProgramDetailsResponse.model_validate({
+        "program": program,
+        "terms": program.terms,
+        "lessons": [lesson for term in program.terms for lesson in term.lessons],
+    })
 
 
 # ================= LESSONS =================
-@router.post("/programs/{program_id}/lessons")
-def add_lesson(program_id: str, data: dict, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+@router.post("/programs/{program_id}/lessons", response_model=LessonOut)
+async def add_lesson(program_id: str, data: dict, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _add_lesson, program_id, data)
+
+
+def _add_lesson(db: Session, program_id: str, data: dict):
     program = db.query(Program).filter(Program.id == program_id).first()
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
 
-    term = db.query(Term).filter(Term.program_id == program_id).first()
+    term = db.query(Term).filter(Term.program_id == program_id).order_by(Term.term_number).first()
     if not term:
         # auto-create term 1 if missing
         term = Term(program_id=program_id, term_number=1, title="Default Term")
@@ -98,7 +172,7 @@ def add_lesson(program_id: str, data: dict, db: Session = Depends(get_db), user=
         db.commit()
         db.refresh(term)
 
-    next_lesson_num = (db.query(Lesson).filter(Lesson.term_id == term.id).count() or 0) + 1
+    next_lesson_num = reserve_lesson_numbers(db, term.id)
 
     new_lesson = Lesson(
         program_id=program_id,  # THIS FIXES THE ERROR
@@ -117,13 +191,69 @@ def add_lesson(program_id: str, data: dict, db: Session = Depends(get_db), user=
     db.refresh(new_lesson)
     return new_lesson
 
-@router.post("/lessons/{lesson_id}/schedule")
-def schedule_lesson_publish(lesson_id: str, data: dict, background_tasks: BackgroundTasks,
-                            db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+@router.post("/programs/{program_id}/lessons:bulk", response_model=BulkImportResponse)
+async def bulk_import_lessons(
+    program_id: str,
+    request: Request,
+    batch_size: int = Query(BULK_IMPORT_BATCH_SIZE, ge=1, le=5000),
+    db=Depends(get_async_db),
+    user=Depends(require_admin_or_editor),
+):
+    """
+    Import many lessons from a streamed body.
+    Send NDJSON (Content-Type: application/x-ndjson) or a JSON array of lesson
+    objects shaped like the add_lesson payload, plus an optional "term_number".
+    Rows are parsed as they arrive and inserted `batch_size` at a time.
+    """
+    program = await run_db(db, lambda s: s.query(Program.id).filter(Program.id == program_id).first())
+    if not program:
+        raise HTTPException(status_code=404, detail="Program not found")
+
+    importer = LessonImporter(program_id)
+    await run_db(db, importer.load)
+
+    content_type = request.headers.get("content-type", "")
+    line_delimited = "ndjson" in content_type or "jsonl" in content_type
+    inserted, errors, batch = 0, [], []
+
+    async def flush():
+        nonlocal inserted
+        try:
+            await run_db(db, importer.flush, [row for _, row in batch])
+            inserted += len(batch)
+        except Exception as e:
+            await run_db(db, Session.rollback)
+            reason = getattr(e, "orig", None) or e
+            errors.extend({"row": n, "error": f"Insert failed: {reason}"} for n, _ in batch)
+        batch.clear()
+
+    async for row_number, data, error in iter_json_rows(request.stream(), line_delimited):
+        if error is None:
+            try:
+                batch.append((row_number, importer.build_row(data)))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            errors.append({"row": row_number, "error": error})
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
+
+@router.post("/lessons/{lesson_id}/schedule", response_model=MessageResponse)
+async def schedule_lesson_publish(lesson_id: str, data: dict,
+                                  db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
     """
     Schedule a lesson for publishing in the future.
     Payload example: { "publish_in_minutes": 2 }
     """
+    return await run_db(db, _schedule_lesson_publish, lesson_id, data)
+
+
+def _schedule_lesson_publish(db: Session, lesson_id: str, data: dict):
     lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
@@ -131,14 +261,22 @@ def schedule_lesson_publish(lesson_id: str, data: dict, background_tasks: Backgr
     publish_delay = data.get("publish_in_minutes", 1)
     lesson.status = StatusEnum.scheduled
     lesson.publish_at = datetime.utcnow() + timedelta(minutes=publish_delay)
+    refresh_lessons(db, [lesson.id])
     db.commit()
+    # A previously published lesson leaves the catalog until it goes live again
+    invalidate_catalog([lesson.program_id])
 
-    background_tasks.add_task(run_scheduled_publisher)
+    # Wake the scheduler so it re-reads the next due time
+    notify_schedule_changed()
     return {"message": f"Lesson scheduled to publish in {publish_delay} minutes."}
 
 
 @router.post("/lessons/{lesson_id}/publish")
-def publish_lesson(lesson_id: str, db: Session = Depends(get_db)):
+async def publish_lesson(lesson_id: str, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _publish_lesson, lesson_id)
+
+
+def _publish_lesson(db: Session, lesson_id: str):
     lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
     if not lesson:
         return {"error": "Lesson not found"}, 404
@@ -150,13 +288,9 @@ def publish_lesson(lesson_id: str, db: Session = Depends(get_db)):
     if not lesson.content_urls_by_language or not lesson.content_urls_by_language.get(lesson.content_language_primary):
         errors.append("Missing content URL for primary language.")
 
-    # Thumbnail validation
-    if not lesson.thumbnail_assets_by_language:
-        errors.append("Missing thumbnails.")
-    else:
-        lang_assets = lesson.thumbnail_assets_by_language.get(lesson.content_language_primary, {})
-        if not lang_assets.get("portrait") or not lang_assets.get("landscape"):
-            errors.append("Portrait or landscape thumbnail missing for primary language.")
+    # Thumbnail validation (lesson_assets rows)
+    if missing_thumbnails(db, [lesson]):
+        errors.append("Portrait or landscape thumbnail missing for primary language.")
 
     # If errors exist, block publish
     if errors:
@@ -165,48 +299,96 @@ def publish_lesson(lesson_id: str, db: Session = Depends(get_db)):
     #  Update status and publish time
     lesson.status = StatusEnum.published
     lesson.published_at = datetime.utcnow()
+    refresh_lessons(db, [lesson.id])
     db.commit()
+    invalidate_catalog([lesson.program_id])
 
     return {"status": "success", "message": f"Lesson '{lesson.title}' published successfully."}
 
-@router.post("/lessons/{lesson_id}/archive")
-def archive_lesson(lesson_id: str, db: Session = Depends(get_db), user=Depends(require_admin_or_editor)):
+@router.post("/lessons/{lesson_id}/archive", response_model=LessonMessageResponse)
+async def archive_lesson(lesson_id: str, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    return await run_db(db, _archive_lesson, lesson_id)
+
+
+def _archive_lesson(db: Session, lesson_id: str):
     lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
 
     lesson.status = StatusEnum.archived
+    refresh_lessons(db, [lesson.id])
     db.commit()
+    invalidate_catalog([lesson.program_id])
     db.refresh(lesson)
     return {"message": "Lesson archived", "lesson": lesson}
 
-def validate_program_assets(program):
-    """Safe validation: logs missing assets but never blocks publishing."""
+
+class LessonBatchFilter(BaseModel):
+    program_id: str | None = None
+    term_id: str | None = None
+    status: StatusEnum | None = None
+
+
+class LessonBatchRequest(BaseModel):
+    action: Literal["publish", "archive", "schedule"]
+    ids: list[str] | None = None
+    filter: LessonBatchFilter | None = None
+    # schedule only: an explicit time, or minutes from now (default 1)
+    publish_at: datetime | None = None
+    publish_in_minutes: int | None = None
+
+
+@router.post("/lessons:batch", response_model=LessonBatchResponse)
+async def batch_lessons(data: LessonBatchRequest, db=Depends(get_async_db), user=Depends(require_admin_or_editor)):
+    """
+    Publish, archive or schedule many lessons in one transaction.
+    Select them by "ids", by "filter" (e.g. {"term_id": ...} for a whole term), or both.
+    Payload example: { "action": "publish", "filter": { "term_id": "...", "status": "draft" } }
+    Returns a result per lesson; lessons that fail validation are left unchanged.
+    """
+    return await run_db(db, _batch_lessons, data)
+
+
+def _batch_lessons(db: Session, data: LessonBatchRequest):
+    filters = data.filter.model_dump(exclude_none=True) if data.filter else {}
+    if data.ids is None and not (filters.get("program_id") or filters.get("term_id")):
+        raise HTTPException(status_code=400, detail="Provide ids or a program_id/term_id filter")
+    ids = list(dict.fromkeys(data.ids)) if data.ids is not None else None
+
     try:
-        if not getattr(program, "poster_assets_by_language", None):
-            print(f" Missing poster_assets_by_language for program '{program.title}', skipping strict validation.")
-            return True
-        if not isinstance(program.poster_assets_by_language, dict):
-            print(f"poster_assets_by_language is not a valid dict for program '{program.title}'.")
-            return True
-        if "en" not in program.poster_assets_by_language:
-            print(f"Program '{program.title}' missing English assets, skipping validation.")
-            return True
-        return True
-    except Exception as e:
-        print(f"Validation check failed for program '{getattr(program, 'title', '?')}': {e}")
-        return True
-
-
-def validate_lesson_assets(lesson: Lesson):
-    lang = lesson.content_language_primary
-    thumbs = lesson.thumbnail_assets_by_language or {}
-    lang_assets = thumbs.get(lang, {})
-
-    required_variants = ["portrait", "landscape"]
-    for variant in required_variants:
-        if not lang_assets.get(variant):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required lesson thumbnail '{variant}' for {lang}."
-            )
+        results, program_ids = apply_batch(
+            db, data.action, ids,
+            publish_at=schedule_time(data.publish_at, data.publish_in_minutes),
+            **filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    invalidate_catalog(program_ids)
+    if data.action == "schedule" and program_ids:
+        notify_schedule_changed()
+
+    succeeded = sum(result["ok"] for result in results)
+    return {
+        "action": data.action,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+def validate_program_assets(db: Session, program):
+    """Safe validation: logs missing posters but never blocks publishing."""
+    posters = load_program_assets(db, [program.id])
+    if not resolve_assets(posters, program.id, AssetTypeEnum.poster, program.language_primary):
+        print(f" Program '{program.title}' has no {program.language_primary} posters.")
+    return True
+
+
+def validate_lesson_assets(db: Session, lesson: Lesson):
+    missing = missing_thumbnails(db, [lesson]).get(lesson.id)
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing required lesson thumbnail '{missing[0]}' for {lesson.content_language_primary}."
+        )
@@ -1,7 +1,13 @@
 from fastapi import APIRouter
+from app.database import pool_stats, test_connection
 
 router = APIRouter()
 
 @router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/health/db")
+def db_health():
+    return {"connected": test_connection(), **pool_stats()}
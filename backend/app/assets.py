@@ -0,0 +1,128 @@
+# backend/app/assets.py
+"""Artwork lookups against program_assets / lesson_assets, the single source of truth.
+
+The legacy JSON columns (Program.poster_assets_by_language,
+Lesson.thumbnail_assets_by_language, Lesson.assets) were backfilled into the
+tables by migration 0008 and are no longer read. Every loader here is one
+query for any number of owners and returns an index keyed by
+(owner_id, asset_type, language) -> {variant: url}.
+"""
+from sqlalchemy import select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models_program import (
+    AssetTypeEnum, AssetVariantEnum, Lesson, LessonAsset, ProgramAsset, StatusEnum, gen_uuid,
+)
+
+# A lesson can't be published without these thumbnails in its primary language
+REQUIRED_THUMBNAILS = (AssetVariantEnum.portrait, AssetVariantEnum.landscape)
+
+
+def _program_rows(program_ids):
+    return select(
+        ProgramAsset.program_id.label("owner_id"),
+        ProgramAsset.asset_type,
+        ProgramAsset.language,
+        ProgramAsset.variant,
+        ProgramAsset.url,
+    ).where(ProgramAsset.program_id.in_(program_ids))
+
+
+def _lesson_rows():
+    return select(
+        LessonAsset.lesson_id.label("owner_id"),
+        LessonAsset.asset_type,
+        LessonAsset.language,
+        LessonAsset.variant,
+        LessonAsset.url,
+    )
+
+
+def _index(rows):
+    assets = {}
+    for row in rows:
+        key = (row.owner_id, AssetTypeEnum(row.asset_type), row.language)
+        assets.setdefault(key, {})[getattr(row.variant, "value", row.variant)] = row.url
+    return assets
+
+
+def load_program_assets(db, program_ids):
+    """Asset index of the given programs (not their lessons)."""
+    if not program_ids:
+        return {}
+    return _index(db.execute(_program_rows(list(program_ids))))
+
+
+def load_lesson_assets(db, lesson_ids):
+    """Asset index of the given lessons."""
+    if not lesson_ids:
+        return {}
+    return _index(db.execute(_lesson_rows().where(LessonAsset.lesson_id.in_(list(lesson_ids)))))
+
+
+def load_catalog_assets(db, program_ids):
+    """Asset index of the programs and their published lessons, in one query."""
+    lesson_assets = (
+        _lesson_rows()
+        .join(Lesson, Lesson.id == LessonAsset.lesson_id)
+        .where(Lesson.program_id.in_(program_ids), Lesson.status == StatusEnum.published)
+    )
+    return _index(db.execute(union_all(_program_rows(program_ids), lesson_assets)))
+
+
+def resolve_assets(assets, owner_id, asset_type, language, fallback=None):
+    """{variant: url} for `language`; variants it lacks come from `fallback`."""
+    urls = dict(assets.get((owner_id, asset_type, fallback), {})) if fallback else {}
+    urls.update(assets.get((owner_id, asset_type, language), {}))
+    return urls
+
+
+def missing_thumbnails(db, lessons):
+    """{lesson_id: [variant, ...]} of required primary-language thumbnails each lesson lacks."""
+    assets = load_lesson_assets(db, [lesson.id for lesson in lessons])
+    missing = {}
+    for lesson in lessons:
+        urls = assets.get((lesson.id, AssetTypeEnum.thumbnail, lesson.content_language_primary), {})
+        absent = [variant.value for variant in REQUIRED_THUMBNAILS if not urls.get(variant.value)]
+        if absent:
+            missing[lesson.id] = absent
+    return missing
+
+
+def blob_rows(owner_key, owner_id, asset_type, blob):
+    """Asset rows for a {language: {variant: url}} payload in the legacy blob shape."""
+    if not isinstance(blob, dict):
+        raise ValueError(f"{asset_type.value} assets must be an object of {{language: {{variant: url}}}}")
+    rows = []
+    for language, urls in blob.items():
+        if not isinstance(urls, dict):
+            raise ValueError(f"{asset_type.value} assets for '{language}' must be an object")
+        for variant, url in urls.items():
+            if variant not in AssetVariantEnum.__members__:
+                raise ValueError(f"Unknown asset variant '{variant}'")
+            if url:
+                rows.append({
+                    "id": gen_uuid(),
+                    owner_key: owner_id,
+                    "language": language,
+                    "asset_type": asset_type,
+                    "variant": AssetVariantEnum(variant),
+                    "url": url,
+                })
+    return rows
+
+
+def upsert_assets(db, model, rows):
+    """Insert rows, replacing the URL of an existing (owner, language, asset_type, variant)."""
+    if not rows:
+        return
+    owner = "program_id" if model is ProgramAsset else "lesson_id"
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(model.__table__)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[owner, "language", "asset_type", "variant"],
+            set_={"url": stmt.excluded.url},
+        ),
+        rows,
+    )
@@ -1,31 +1,154 @@
-from passlib.context import CryptContext
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from passlib.context import CryptContext
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select, update
+from app.cache import TTLCache
+from app.database import SessionLocal
+from app.models_user import User
 
-SECRET_KEY = "super_secret_key_123"
+# --- Signing key: required, unless JWT_ALLOW_DEV_SECRET opts a local run into a fixed one ---
+SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+if not SECRET_KEY:
+    if os.getenv("JWT_ALLOW_DEV_SECRET", "false").lower() not in ("1", "true", "yes"):
+        raise RuntimeError(
+            " JWT_SECRET_KEY not set. Please export it before running, e.g.:\n"
+            "   set JWT_SECRET_KEY=<long random string>\n"
+            " (or JWT_ALLOW_DEV_SECRET=true for local development only)"
+        )
+    SECRET_KEY = "super_secret_key_123"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+
+# How long a decoded token / a user's role and token version are trusted
+# before re-checking. Bounds how long a role change or a revocation made by
+# another process takes to apply; revocations in this process apply at once.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# bcrypt cost factor; hashes made with another value are upgraded on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads doing bcrypt work. bcrypt releases the GIL, so this caps how many
+# cores a login burst can take while catalog requests keep flowing.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+_password_pool = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# token -> claims, and user id -> (role, token_version)
+token_cache = TTLCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
-def create_access_token(data: dict):
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    return pwd_context.hash("not-a-real-password")
+
+async def verify_and_update_password(plain: str, hashed: str | None):
+    """(valid, new_hash) computed on the bcrypt pool, never on the event loop.
+
+    new_hash is set when `hashed` uses outdated parameters and should be
+    stored. With no stored hash (unknown user) a dummy hash is checked, so
+    response time does not reveal which accounts exist.
+    """
+    loop = asyncio.get_running_loop()
+    if hashed is None:
+        hashed = await loop.run_in_executor(_password_pool, _dummy_hash)
+        await loop.run_in_executor(_password_pool, pwd_context.verify, plain, hashed)
+        return False, None
+    return await loop.run_in_executor(_password_pool, pwd_context.verify_and_update, plain, hashed)
+
+def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def issue_token(user: User) -> str:
+    """Access token for `user`; `ver` ties it to the user's current token_version."""
+    return create_access_token({"sub": user.id, "role": user.role, "ver": user.token_version or 0})
+
+def _unauthorized(detail="Invalid token"):
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+def _claims(token: str) -> dict:
+    claims = token_cache.get(token)
+    if claims is None:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise _unauthorized()
+        token_cache.set(token, claims)
+    elif claims["exp"] <= time.time():
+        raise _unauthorized("Token expired")
+    return claims
+
+def _user_state(user_id: str):
+    """(role, token_version) of a user, or None if it no longer exists."""
+    state = user_cache.get(user_id)
+    if state is None:
+        generation = user_cache.generation  # a revoke during the read must not be cached over
+        db = SessionLocal()
+        try:
+            row = db.execute(select(User.role, User.token_version).where(User.id == user_id)).first()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        state = (row.role, row.token_version or 0)
+        user_cache.set(user_id, state, generation)
+    return state
+
 def decode_token(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    """The caller's {"id", "role"}; cached, so most requests never touch the DB."""
+    claims = _claims(token)
+    state = _user_state(claims.get("sub"))
+    if state is None:
+        raise _unauthorized()
+    role, token_version = state
+    if claims.get("ver", 0) != token_version:
+        raise _unauthorized("Token revoked")
+    return {"id": claims["sub"], "role": role}
+
+def revoke_tokens(db, user_id: str):
+    """Invalidate every token issued to a user so far (bumps token_version)."""
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    user_cache.delete(user_id)
+
+# Logins that used to be hard-coded in app/api/auth.py; created if missing
+DEMO_USERS = [
+    ("admin@cms.com", "admin123", "admin"),
+    ("editor@cms.com", "editor123", "editor"),
+]
+
+def ensure_demo_users(db):
+    existing = set(db.execute(select(User.username)).scalars())
+    missing = [
+        User(username=email, password_hash=hash_password(password), role=role)
+        for email, password, role in DEMO_USERS
+        if email not in existing
+    ]
+    if missing:
+        db.add_all(missing)
+        db.commit()
+        print(f" Added {len(missing)} demo users.")
@@ -0,0 +1,120 @@
+# backend/app/cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Key scope used for whole-catalog listings (as opposed to a single program).
+CATALOG_LISTING = "__listing__"
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    Every invalidation bumps `generation`. A reader takes it before loading a
+    value and passes it to set(), which then drops the value if an
+    invalidation ran in between (the load may have seen the old data).
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_sets = 0
+        self.generation = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_sets += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose key matches `predicate`."""
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_sets": self.stale_sets,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# --- Published catalog cache ---
+# Keys are tuples whose first element is the program id (or CATALOG_LISTING),
+# followed by the request parameters that shape the payload (language, ...).
+catalog_cache = TTLCache(
+    max_entries=int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60")),
+)
+
+
+# Called as publish(program_ids, listing) after each invalidate_catalog() so
+# other processes can evict too; app.notify registers one on PostgreSQL
+invalidation_publishers = []
+
+
+def evict_catalog(program_ids=(), listing=False):
+    """Evict cached catalog payloads for the given programs, in this process only."""
+    program_ids = set(program_ids)
+    if listing:
+        program_ids.add(CATALOG_LISTING)
+    if program_ids:
+        catalog_cache.invalidate_where(lambda key: key[0] in program_ids)
+
+
+def invalidate_catalog(program_ids=(), listing=False):
+    """Evict cached catalog payloads for the given programs, in every process.
+
+    Pass listing=True when a program entered or left the published set, or
+    its own fields changed, so the program listings are rebuilt as well.
+    """
+    program_ids = set(program_ids)
+    evict_catalog(program_ids, listing)
+    for publish in invalidation_publishers:
+        publish(program_ids, listing)
@@ -0,0 +1,241 @@
+# backend/app/catalog_projection.py
+"""Maintains catalog_entries, the denormalized read model behind /catalog.
+
+Every published program gets one row per language it is offered in, and each
+of its published lessons one row per language, carrying only that language's
+content URL, subtitle and assets from the asset tables (falling back to the
+primary language where one is missing). Write paths re-project inside the
+transaction that changes a status, also syncing the SQLite search index (see
+app.search): refresh_lessons() rewrites only the given lessons' rows,
+refresh_programs() whole programs when a program itself changes.
+`python -m app.catalog_projection` rebuilds both.
+"""
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, insert, select
+from app.assets import load_catalog_assets, load_lesson_assets, resolve_assets
+from app.database import SessionLocal
+from app.search import clear_search_index, index_lessons, index_programs
+from app.models_program import (
+    AssetTypeEnum, CatalogEntry, Lesson, Program, StatusEnum, column_values, gen_uuid,
+)
+
+PROGRAM = "program"
+LESSON = "lesson"
+
+# Per-language blobs (artwork ones are legacy, see app.assets); payloads carry
+# the resolved value for one language instead
+PROGRAM_BLOBS = {"poster_assets_by_language"}
+LESSON_BLOBS = {
+    "assets", "content_urls_by_language", "subtitle_urls_by_language", "thumbnail_assets_by_language",
+}
+
+# Keys of a program payload (what `fields=` may select)
+PROGRAM_FIELDS = (set(Program.__table__.columns.keys()) - PROGRAM_BLOBS) | {"language", "poster"}
+
+# Programs re-projected per statement batch during a rebuild
+REBUILD_CHUNK_SIZE = 200
+
+
+def _languages(program):
+    """Primary language first, then the other available ones."""
+    languages = [program.language_primary]
+    for language in program.languages_available or []:
+        if language not in languages:
+            languages.append(language)
+    return languages
+
+
+def _program_payload(program, assets, language):
+    values = column_values(program)
+    return jsonable_encoder({
+        **{k: v for k, v in values.items() if k not in PROGRAM_BLOBS},
+        "language": language,
+        "poster": resolve_assets(
+            assets, program.id, AssetTypeEnum.poster, language, program.language_primary
+        ),
+    })
+
+
+def _lesson_payload(lesson, assets, language):
+    content_urls = lesson.content_urls_by_language or {}
+    content_language = language if content_urls.get(language) else lesson.content_language_primary
+    subtitle_urls = lesson.subtitle_urls_by_language or {}
+    values = column_values(lesson)
+    return jsonable_encoder({
+        **{k: v for k, v in values.items() if k not in LESSON_BLOBS},
+        "language": language,
+        "content_language": content_language,
+        "content_url": content_urls.get(content_language),
+        "subtitle_url": subtitle_urls.get(language) or subtitle_urls.get(lesson.content_language_primary),
+        "thumbnails": resolve_assets(
+            assets, lesson.id, AssetTypeEnum.thumbnail, language, lesson.content_language_primary
+        ),
+    })
+
+
+def _common(program, language, now):
+    return {
+        "program_id": program.id,
+        "language": language,
+        "is_primary": language == program.language_primary,
+        "published_at": program.published_at,
+        "refreshed_at": now,
+    }
+
+
+def _lesson_entry(program, lesson, assets, language, now):
+    # Positioned by lesson number (ties broken by entry_id when read), so one
+    # lesson can be re-projected without renumbering its siblings
+    return {
+        **_common(program, language, now),
+        "id": gen_uuid(),
+        "entry_id": lesson.id,
+        "entry_type": LESSON,
+        "position": lesson.lesson_number,
+        "payload": _lesson_payload(lesson, assets, language),
+    }
+
+
+def build_entries(program, assets, lessons, now):
+    """catalog_entries rows for one published program and its published lessons."""
+    rows = []
+    for language in _languages(program):
+        rows.append({
+            **_common(program, language, now),
+            "id": gen_uuid(),
+            "entry_id": program.id,
+            "entry_type": PROGRAM,
+            "position": 0,
+            "payload": _program_payload(program, assets, language),
+        })
+        rows.extend(_lesson_entry(program, lesson, assets, language, now) for lesson in lessons)
+    return rows
+
+
+def refresh_programs(db, program_ids):
+    """Re-project the given programs in the caller's transaction (no commit).
+
+    Unpublished or deleted programs simply lose their entries. Returns the
+    number of rows written.
+    """
+    program_ids = list(set(program_ids))
+    if not program_ids:
+        return 0
+    # The session does not autoflush; make pending status changes visible
+    db.flush()
+
+    # Lock the program rows so concurrent refreshes of one program serialize;
+    # always in id order, so two refreshes of overlapping programs can't deadlock
+    # (FOR UPDATE is omitted on SQLite, which already serializes writers)
+    programs = db.execute(
+        select(Program)
+        .where(Program.id.in_(program_ids), Program.status == StatusEnum.published)
+        .order_by(Program.id)
+        .with_for_update()
+    ).scalars().all()
+    db.execute(
+        delete(CatalogEntry)
+        .where(CatalogEntry.program_id.in_(program_ids))
+        .execution_options(synchronize_session=False)
+    )
+    if not programs:
+        index_programs(db, program_ids, [], [])
+        return 0
+
+    published_ids = [program.id for program in programs]
+    lessons_by_program = {}
+    lessons = db.execute(
+        select(Lesson)
+        .where(Lesson.program_id.in_(published_ids), Lesson.status == StatusEnum.published)
+        .order_by(Lesson.lesson_number, Lesson.id)
+    ).scalars().all()
+    for lesson in lessons:
+        lessons_by_program.setdefault(lesson.program_id, []).append(lesson)
+    assets = load_catalog_assets(db, published_ids)
+    index_programs(db, program_ids, programs, lessons)
+
+    now = datetime.utcnow()
+    rows = []
+    for program in programs:
+        rows.extend(build_entries(program, assets, lessons_by_program.get(program.id, []), now))
+    if rows:
+        db.execute(insert(CatalogEntry), rows)
+    return len(rows)
+
+
+def refresh_lessons(db, lesson_ids):
+    """Re-project only the given lessons in the caller's transaction (no commit).
+
+    Their programs' rows and sibling lessons are left alone. A lesson that is
+    not published, or whose program is not, just loses its entries. Returns
+    the number of rows written.
+    """
+    lesson_ids = list(set(lesson_ids))
+    if not lesson_ids:
+        return 0
+    db.flush()
+
+    # Lock only the lesson rows (in id order), which the caller's UPDATE has
+    # usually locked already; the programs stay unlocked so lesson writes on
+    # one program don't serialize on it
+    published = db.execute(
+        select(Lesson, Program)
+        .join(Program, Program.id == Lesson.program_id)
+        .where(
+            Lesson.id.in_(lesson_ids),
+            Lesson.status == StatusEnum.published,
+            Program.status == StatusEnum.published,
+        )
+        .order_by(Lesson.id)
+        .with_for_update(of=Lesson)
+    ).all()
+    db.execute(
+        delete(CatalogEntry)
+        .where(CatalogEntry.entry_id.in_(lesson_ids))
+        .execution_options(synchronize_session=False)
+    )
+    index_lessons(db, lesson_ids, [lesson for lesson, _ in published])
+    if not published:
+        return 0
+
+    assets = load_lesson_assets(db, [lesson.id for lesson, _ in published])
+    now = datetime.utcnow()
+    rows = [
+        _lesson_entry(program, lesson, assets, language, now)
+        for lesson, program in published
+        for language in _languages(program)
+    ]
+    db.execute(insert(CatalogEntry), rows)
+    return len(rows)
+
+
+def rebuild_catalog(db):
+    """Reconstruct catalog_entries from scratch in one transaction; returns the row count."""
+    db.execute(delete(CatalogEntry))
+    clear_search_index(db)
+    program_ids = db.execute(
+        select(Program.id).where(Program.status == StatusEnum.published)
+    ).scalars().all()
+    count = 0
+    for start in range(0, len(program_ids), REBUILD_CHUNK_SIZE):
+        count += refresh_programs(db, program_ids[start:start + REBUILD_CHUNK_SIZE])
+    db.commit()
+    return count
+
+
+def ensure_catalog_projection(db):
+    """Build the projection if it is empty but published programs exist (e.g. after upgrading)."""
+    if db.execute(select(CatalogEntry.id).limit(1)).first():
+        return
+    if db.execute(select(Program.id).where(Program.status == StatusEnum.published).limit(1)).first():
+        print("[Catalog] Projection empty — rebuilding catalog entries...")
+        print(f"[Catalog] Rebuilt {rebuild_catalog(db)} catalog entries.")
+
+
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        print(f"[Catalog] Rebuilt {rebuild_catalog(session)} catalog entries.")
+    finally:
+        session.close()
@@ -0,0 +1,74 @@
+# backend/app/compression.py
+import os
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# Bodies smaller than this go out uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def _accepted_encodings(header):
+    """Codings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size, quality=BROTLI_QUALITY, **kwargs):
+        super().__init__(app, minimum_size, **kwargs)
+        self.quality = quality
+        self.compressor = None
+
+    async def apply_compression(self, body, *, more_body):
+        if self.compressor is None:
+            self.compressor = brotli.Compressor(quality=self.quality)
+        out = self.compressor.process(body)
+        # Flush every chunk so streamed rows reach the client as they are produced
+        return out + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """gzip/brotli negotiation on Accept-Encoding; brotli wins when both are accepted."""
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=GZIP_LEVEL):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        options = {"exclude_content_types": self.exclude_content_types}
+        if brotli is not None and "br" in accepted:
+            responder = BrotliResponder(self.app, self.minimum_size, **options)
+        elif "gzip" in accepted:
+            responder = GZipResponder(
+                self.app,
+                self.minimum_size,
+                compresslevel=self.compresslevel,
+                thread_minimum_size=self.thread_minimum_size,
+                **options,
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size, **options)
+        await responder(scope, receive, send)
@@ -1,8 +1,13 @@
 # backend/app/database.py
 import os
-from sqlalchemy import create_engine
+import time
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import OperationalError
+from app.metrics import attach_query_metrics
+from app.pool_metrics import PoolMetrics, SessionMetrics, attach_pool_metrics, instrumented_pool
 
 # --- Get DB URL ---
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -17,38 +22,123 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# --- Pin psycopg2 (app.notify's LISTEN loop uses its notification API) ---
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
+
 # --- Handle SSL for Render Postgres ---
 connect_args = {}
 if "render.com" in DATABASE_URL:
     connect_args["sslmode"] = "require"
 
+# --- Pool settings (size them per gunicorn worker: total = workers * (size + overflow)) ---
+# DB_POOL_PRE_PING=always pings on every checkout (one extra round trip);
+# "never" relies on DB_POOL_RECYCLE to retire connections before the server drops them.
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "always").lower() in ("always", "1", "true", "yes")
+pool_options = {"pool_pre_ping": POOL_PRE_PING}
+if not DATABASE_URL.startswith("sqlite"):
+    pool_options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+
 # --- Create engine ---
+pool_metrics = PoolMetrics("sync")
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    pool_pre_ping=True,
+    poolclass=instrumented_pool(DATABASE_URL, pool_metrics),
+    **pool_options,
 )
+attach_pool_metrics(engine, pool_metrics)
+attach_query_metrics(engine)
+session_metrics = SessionMetrics()
 
 # --- Session factory ---
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# --- Optional async engine for the API routers (DB_ASYNC=1) ---
+# asyncpg for Postgres, aiosqlite for SQLite. The worker and scripts always use
+# the sync engine above; only request handling switches.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+
+def _async_url(url):
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+async_engine = None
+async_pool_metrics = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_pool_metrics = PoolMetrics("async")
+    async_engine = create_async_engine(
+        _async_url(DATABASE_URL),
+        # asyncpg takes `ssl` rather than libpq's `sslmode`
+        connect_args={"ssl": "require"} if "sslmode" in connect_args else {},
+        poolclass=instrumented_pool(_async_url(DATABASE_URL), async_pool_metrics),
+        **pool_options,
+    )
+    attach_pool_metrics(async_engine.sync_engine, async_pool_metrics)
+    attach_query_metrics(async_engine.sync_engine)
+    # Objects stay loaded after commit; an expired attribute can't lazy-load outside the greenlet
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # --- Declarative base ---
 Base = declarative_base()
 
 # --- Dependency for FastAPI routes ---
-def get_db():
-    db = SessionLocal()
+async def get_async_db():
+    """The session every route uses: an AsyncSession when DB_ASYNC is on, else a sync Session.
+
+    Handlers pass it to run_db() rather than calling it directly.
+    """
+    opened = time.perf_counter()
     try:
-        yield db
+        if AsyncSessionLocal is None:
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                # close() returns the connection to the pool with a ROLLBACK; keep that off the loop
+                await run_in_threadpool(db.close)
+        else:
+            async with AsyncSessionLocal() as db:
+                yield db
     finally:
-        db.close()
+        session_metrics.record(time.perf_counter() - opened)
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Run sync ORM code `fn(session, *args)` from an async handler without blocking the loop.
+
+    With an AsyncSession the function runs on the async connection via run_sync;
+    with a sync Session it runs in the threadpool, as a plain `def` route would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
 
 # --- Health check helper ---
 def test_connection():
     """Used in /health endpoint to verify DB connection."""
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         return True
     except OperationalError:
         return False
+
+
+def pool_stats():
+    """Pool and session lifecycle counters, for sizing pools per worker."""
+    stats = {"sync_pool": pool_metrics.snapshot(), "sessions": session_metrics.snapshot()}
+    if async_pool_metrics is not None:
+        stats["async_pool"] = async_pool_metrics.snapshot()
+    return stats
@@ -1,11 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from app.auth import decode_token
 
+# The authenticated caller: {"id", "role"}
+get_current_user = decode_token
+
 def require_role(required: list):
-    def wrapper(user: dict = Depends(decode_token)):
+    def wrapper(user: dict = Depends(get_current_user)):
         role = user.get("role")
         if role not in required:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
         return user
 
     return wrapper
+
+require_admin = require_role(["admin"])
+require_admin_or_editor = require_role(["admin", "editor"])
@@ -0,0 +1,118 @@
+# backend/app/lesson_batch.py
+"""Publish / archive / schedule many lessons in one transaction.
+
+Targets are read in one query, validated in one pass (thumbnails through one
+app.assets lookup), and every lesson that passes is changed with a single
+set-based UPDATE; the changed lessons are re-projected before the commit.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from app.assets import missing_thumbnails
+from app.catalog_projection import refresh_lessons
+from app.models_program import Lesson, StatusEnum
+
+# Upper bound on lessons per batch request (ids or filter matches)
+LESSON_BATCH_LIMIT = int(os.getenv("LESSON_BATCH_LIMIT", "1000"))
+
+PUBLISH = "publish"
+ARCHIVE = "archive"
+SCHEDULE = "schedule"
+
+TARGET_STATUS = {
+    PUBLISH: StatusEnum.published,
+    ARCHIVE: StatusEnum.archived,
+    SCHEDULE: StatusEnum.scheduled,
+}
+
+
+def load_targets(db, ids=None, program_id=None, term_id=None, status=None):
+    """Lessons selected by `ids` and/or the filter, in request order; raises ValueError past the limit."""
+    stmt = select(Lesson)
+    if ids is not None:
+        stmt = stmt.where(Lesson.id.in_(ids))
+    if program_id:
+        stmt = stmt.where(Lesson.program_id == program_id)
+    if term_id:
+        stmt = stmt.where(Lesson.term_id == term_id)
+    if status:
+        stmt = stmt.where(Lesson.status == status)
+    lessons = db.execute(
+        stmt.order_by(Lesson.program_id, Lesson.lesson_number, Lesson.id).limit(LESSON_BATCH_LIMIT + 1)
+    ).scalars().all()
+    if len(lessons) > LESSON_BATCH_LIMIT:
+        raise ValueError(f"Batch matches more than {LESSON_BATCH_LIMIT} lessons; narrow the filter")
+    if ids is not None:
+        position = {lesson_id: n for n, lesson_id in enumerate(ids)}
+        lessons.sort(key=lambda lesson: position[lesson.id])
+    return lessons
+
+
+def validation_errors(db, action, lessons):
+    """{lesson_id: error} for lessons the action can't apply to.
+
+    Scheduled lessons go live unattended, so they must already pass the
+    publish checks.
+    """
+    errors = {}
+    if action not in (PUBLISH, SCHEDULE):
+        return errors
+    missing = missing_thumbnails(db, lessons)
+    for lesson in lessons:
+        if not (lesson.content_urls_by_language or {}).get(lesson.content_language_primary):
+            errors[lesson.id] = "Missing content URL for primary language."
+        elif lesson.id in missing:
+            errors[lesson.id] = f"Missing {' and '.join(missing[lesson.id])} thumbnail for primary language."
+    return errors
+
+
+def apply_batch(db, action, ids=None, publish_at=None, **filters):
+    """Run `action` on the selected lessons; returns (results, program_ids changed).
+
+    results holds one {"id", "ok", "status", "error"} per requested id (or
+    filter match). Lessons already in the target state count as ok and are
+    left untouched. No commit.
+    """
+    lessons = load_targets(db, ids, **filters)
+    found = {lesson.id: lesson for lesson in lessons}
+    errors = validation_errors(db, action, lessons)
+    target = TARGET_STATUS[action]
+
+    changed = [
+        lesson for lesson in lessons
+        if lesson.id not in errors and (lesson.status != target or action == SCHEDULE)
+    ]
+    if changed:
+        values = {"status": target}
+        if action == PUBLISH:
+            values["published_at"] = datetime.utcnow()
+        elif action == SCHEDULE:
+            values["publish_at"] = publish_at
+        db.execute(
+            update(Lesson)
+            .where(Lesson.id.in_([lesson.id for lesson in changed]))
+            .values(**values)
+        )
+    program_ids = {lesson.program_id for lesson in changed}
+    refresh_lessons(db, [lesson.id for lesson in changed])
+
+    results = []
+    for lesson_id in ids if ids is not None else [lesson.id for lesson in lessons]:
+        lesson = found.get(lesson_id)
+        if lesson is None:
+            results.append({"id": lesson_id, "ok": False, "status": None, "error": "Lesson not found"})
+        elif lesson_id in errors:
+            results.append({"id": lesson_id, "ok": False, "status": lesson.status, "error": errors[lesson_id]})
+        else:
+            results.append({"id": lesson_id, "ok": True, "status": target, "error": None})
+    return results, program_ids
+
+
+def schedule_time(publish_at=None, publish_in_minutes=None):
+    """When scheduled lessons go live: an explicit time, or minutes from now (default 1)."""
+    if publish_at is not None:
+        # Stored as naive UTC, like every other timestamp
+        if publish_at.tzinfo is not None:
+            publish_at = publish_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return publish_at
+    return datetime.utcnow() + timedelta(minutes=publish_in_minutes if publish_in_minutes is not None else 1)
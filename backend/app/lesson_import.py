@@ -0,0 +1,162 @@
+# backend/app/lesson_import.py
+import os
+from sqlalchemy import insert, select
+from app.assets import blob_rows, upsert_assets
+from app.models_program import (
+    AssetTypeEnum, ContentTypeEnum, Lesson, LessonAsset, StatusEnum, Term, gen_uuid, reserve_lesson_numbers,
+)
+
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "500"))
+
+# Optional lesson fields an import row may carry as-is.
+OPTIONAL_FIELDS = {
+    "duration_ms": None,
+    "is_paid": False,
+    "subtitle_languages": [],
+    "subtitle_urls_by_language": {},
+}
+
+
+def _check_languages(field, value):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{field} must be a list of language codes")
+
+
+def _check_urls(field, value):
+    if not isinstance(value, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in value.items()
+    ):
+        raise ValueError(f"{field} must be an object of {{language: url}}")
+
+
+def _check_optional(row):
+    """Type-check OPTIONAL_FIELDS so a bad value fails its own row, not the whole batch."""
+    duration = row["duration_ms"]
+    if duration is not None and (isinstance(duration, bool) or not isinstance(duration, int) or duration < 0):
+        raise ValueError("duration_ms must be a non-negative integer")
+    if not isinstance(row["is_paid"], bool):
+        raise ValueError("is_paid must be true or false")
+    _check_languages("subtitle_languages", row["subtitle_languages"])
+    _check_urls("subtitle_urls_by_language", row["subtitle_urls_by_language"])
+
+
+class LessonImporter:
+    """Turns import rows into lesson inserts for one program.
+
+    Each batch reserves one block of lesson numbers per term from the term's
+    sequence, numbers rows in memory, and is written with one executemany
+    INSERT (plus one for any thumbnails).
+    """
+
+    def __init__(self, program_id):
+        self.program_id = program_id
+        self.term_ids = {}  # term_number -> term id
+        self.default_term_number = 1
+
+    def load(self, db):
+        """Read the program's terms."""
+        terms = db.execute(
+            select(Term.term_number, Term.id)
+            .where(Term.program_id == self.program_id)
+            .order_by(Term.term_number)
+        ).all()
+        for term_number, term_id in terms:
+            self.term_ids.setdefault(term_number, term_id)
+        if terms:
+            self.default_term_number = terms[0].term_number
+
+    def build_row(self, data):
+        """Validate one import row; raises ValueError."""
+        if not isinstance(data, dict):
+            raise ValueError("Row must be a JSON object")
+
+        term_number = data.get("term_number", self.default_term_number)
+        if not isinstance(term_number, int) or term_number < 1:
+            raise ValueError("term_number must be a positive integer")
+
+        content_type = data.get("content_type", "video")
+        if content_type not in ContentTypeEnum.__members__:
+            raise ValueError(f"Unknown content_type '{content_type}'")
+
+        title = data.get("title")
+        if title is not None and not isinstance(title, str):
+            raise ValueError("title must be a string")
+
+        content_language = data.get("content_language_primary", "en")
+        if not isinstance(content_language, str):
+            raise ValueError("content_language_primary must be a string")
+        content_url = data.get("content_url", "")
+        if not isinstance(content_url, str):
+            raise ValueError("content_url must be a string")
+        languages = data.get("content_languages_available", ["en"])
+        _check_languages("content_languages_available", languages)
+        content_urls = data.get("content_urls_by_language", {"en": content_url})
+        _check_urls("content_urls_by_language", content_urls)
+
+        lesson_id = gen_uuid()
+        row = {
+            "id": lesson_id,
+            "program_id": self.program_id,
+            "term_number": term_number,
+            "title": title,
+            "content_type": ContentTypeEnum(content_type),
+            "content_language_primary": content_language,
+            "content_languages_available": languages,
+            "content_urls_by_language": content_urls,
+            "status": StatusEnum.draft,
+        }
+        for field, default in OPTIONAL_FIELDS.items():
+            row[field] = data.get(field, default)
+        _check_optional(row)
+        # Thumbnails are accepted in the legacy blob shape and stored as lesson_assets rows
+        row["thumbnails"] = blob_rows(
+            "lesson_id", lesson_id, AssetTypeEnum.thumbnail, data.get("thumbnail_assets_by_language") or {}
+        )
+        return row
+
+    def flush(self, db, rows):
+        """Insert a batch of built rows in one statement and commit.
+
+        If the batch fails the caller rolls back, so terms created for it are
+        forgotten and recreated by the next batch that needs them.
+        """
+        created = []
+        try:
+            self._write(db, rows, created)
+        except Exception:
+            for term_number in created:
+                self.term_ids.pop(term_number, None)
+            raise
+
+    def _write(self, db, rows, created):
+        missing = {row["term_number"] for row in rows} - self.term_ids.keys()
+        for term_number in sorted(missing):
+            term = Term(program_id=self.program_id, term_number=term_number, title=f"Term {term_number}")
+            db.add(term)
+            db.flush()
+            self.term_ids[term_number] = term.id
+            created.append(term_number)
+
+        per_term = {}
+        for row in rows:
+            per_term[row["term_number"]] = per_term.get(row["term_number"], 0) + 1
+        next_numbers = {
+            term_number: reserve_lesson_numbers(db, self.term_ids[term_number], count)
+            for term_number, count in sorted(per_term.items())
+        }
+
+        params, thumbnails = [], []
+        for row in rows:
+            term_number = row["term_number"]
+            lesson_number = next_numbers[term_number]
+            next_numbers[term_number] += 1
+            params.append({
+                **{k: v for k, v in row.items() if k not in ("term_number", "thumbnails")},
+                "term_id": self.term_ids[term_number],
+                "lesson_number": lesson_number,
+                "title": row["title"] or f"Lesson {lesson_number}",
+            })
+            thumbnails.extend(row["thumbnails"])
+        db.execute(insert(Lesson), params)
+        upsert_assets(db, LessonAsset, thumbnails)
+        db.commit()
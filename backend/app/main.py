@@ -1,14 +1,34 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, cms, catalog
+from app.api import auth, cms, catalog, health
+import os
 import threading
-from app.worker import start_worker
-from app.database import SessionLocal, engine, Base
+from app import notify
+from app.cache import catalog_cache
+from app.worker import request_stop, start_worker, wake_publisher
+from app.auth import ensure_demo_users
+from app.catalog_projection import ensure_catalog_projection
+from app.compression import CompressionMiddleware
+from app.database import SessionLocal
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.migrations import run_migrations
 from app.models_program import Program
-from seed_data import main as run_seed  # assuming your seeding script is named seed_data.py
+from seed_data import seed
 
 app = FastAPI(title="LessonCMS Backend")
 
+# Create the demo admin/editor logins on startup (local/demo environments only)
+SEED_DEMO_USERS = os.getenv("SEED_DEMO_USERS", "false").lower() in ("1", "true", "yes")
+# Run the publisher inside the web process. Set to false when a separate
+# `python -m app.worker` service does the publishing.
+EMBEDDED_WORKER = os.getenv("EMBEDDED_WORKER", "true").lower() in ("1", "true", "yes")
+# Upgrade the schema on startup; set to false when migrations run as a release step.
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+# Catalog cache TTL cap when a standalone worker's invalidations can't reach this process (non-PostgreSQL)
+STANDALONE_CATALOG_TTL_SECONDS = float(os.getenv("STANDALONE_CATALOG_TTL_SECONDS", "5"))
+
 # --- CORS ---
 app.add_middleware(
     CORSMiddleware,
@@ -16,32 +36,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor", "X-Next-Offset", "X-Total-Count"],
 )
 
+# --- Compression (gzip, or brotli when installed) ---
+app.add_middleware(CompressionMiddleware)
+
+# --- Metrics (outermost: times the whole request, compression included) ---
+app.add_middleware(MetricsMiddleware)
+
 # --- Include Routers ---
 app.include_router(auth.router, prefix="/auth")
 app.include_router(cms.router, prefix="/cms")
 app.include_router(catalog.router, prefix="/catalog")
+app.include_router(health.router)
 
 
-@app.on_event("startup")
-def on_startup():
-    """Ensure DB seeded and background worker starts without blocking Render."""
+def bootstrap():
+    """Seed an empty database, backfill the catalog projection and demo logins, then run the publisher.
+
+    Runs on a background thread so none of it delays serving traffic.
+    """
+    db = SessionLocal()
     try:
-        Base.metadata.create_all(bind=engine)
-        db = SessionLocal()
-        if not db.query(Program).first():
-            print("Seeding database (Render startup)...")
-            run_seed()
-        else:
-            print(" Database already has data — skipping seed.")
-        db.close()
+        if not db.query(Program.id).first():
+            print("Seeding empty database...")
+            added = seed(db)
+            print(f" Seeded {added['programs']} programs, {added['lessons']} lessons.")
+        ensure_catalog_projection(db)
+        if SEED_DEMO_USERS:
+            ensure_demo_users(db)
     except Exception as e:
-        print(f" Seeding skipped: {e}")
+        print(f" Startup bootstrap failed: {e}")
+    finally:
+        db.close()
+
+    if EMBEDDED_WORKER:
+        print(" Background worker started.")
+        start_worker()
+    else:
+        print(" Embedded worker disabled (EMBEDDED_WORKER=false); run `python -m app.worker`.")
+
+
+@app.on_event("startup")
+def on_startup():
+    """Only the schema check blocks startup; seeding and the worker run in the background."""
+    if MIGRATE_ON_STARTUP:
+        run_migrations()
+    # Share cache invalidations (and schedule wake-ups for the embedded publisher) with other processes
+    if not notify.start(on_schedule_changed=wake_publisher if EMBEDDED_WORKER else None) and not EMBEDDED_WORKER:
+        catalog_cache.ttl_seconds = min(catalog_cache.ttl_seconds, STANDALONE_CATALOG_TTL_SECONDS)
+    threading.Thread(target=bootstrap, name="bootstrap", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Let the embedded publisher commit its current batch instead of dying mid-transaction
+    request_stop()
+
 
-    # Start worker safely
-    threading.Thread(target=start_worker, daemon=True).start()
-    print(" Background worker thread started successfully!")
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Collectors query the DB (queue depth), so render off the event loop
+    return Response(await run_in_threadpool(render_metrics), media_type=CONTENT_TYPE)
 
 
 @app.get("/")
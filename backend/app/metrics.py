@@ -0,0 +1,134 @@
+# backend/app/metrics.py
+"""Prometheus metrics, on prometheus_client's default registry.
+
+Request latency and per-request DB usage come from MetricsMiddleware and the
+engine hooks in attach_query_metrics(); the publisher records its cycles
+through the worker metrics below (queue depth is a collector in app.worker).
+Served at GET /metrics (and by `python -m app.worker --metrics-port`).
+"""
+import contextvars
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, disable_created_metrics, generate_latest,
+)
+from sqlalchemy import event
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+LAG_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 3600)
+
+# Skip the *_created timestamp series; nothing here needs them
+disable_created_metrics()
+
+
+def render_metrics():
+    return generate_latest(REGISTRY)
+
+
+# --- HTTP ---
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"),
+    buckets=LATENCY_BUCKETS,
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ("route",), buckets=COUNT_BUCKETS
+)
+db_time_per_request = Histogram(
+    "db_query_seconds_per_request", "Time spent in SQL statements per request.", ("route",),
+    buckets=LATENCY_BUCKETS,
+)
+
+# Per-request DB accumulator; sync handlers run in threadpool copies of the
+# request context, which share this mutable object.
+_request_db = contextvars.ContextVar("request_db", default=None)
+
+
+class _QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+def attach_query_metrics(engine):
+    """Count statements and their time against the current request, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _request_db.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - started
+
+
+def route_template(scope):
+    """Full path template of the matched route, e.g. /catalog/programs/{program_id}.
+
+    Whether route.path includes the include_router() prefix depends on the
+    FastAPI version: older ones copy each route with the prefix applied,
+    newer ones (0.14x) match through the included router and leave
+    route.path relative to it (/programs/{program_id}). Either way the
+    template is the literal request-path prefix before the part route.path
+    matches, plus route.path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + route.path
+    return route.path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each request and its DB work, labelled by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _QueryStats()
+        token = _request_db.set(stats)
+        status = {"code": 500}
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_db.reset(token)
+            route = route_template(scope)
+            http_request_duration.labels(scope["method"], route, str(status["code"])).observe(
+                time.perf_counter() - start
+            )
+            db_queries_per_request.labels(route).observe(stats.count)
+            db_time_per_request.labels(route).observe(stats.seconds)
+
+
+# --- Publisher ---
+publish_cycle_duration = Histogram(
+    "publisher_cycle_duration_seconds", "Duration of one publishing cycle.", buckets=LATENCY_BUCKETS
+)
+publish_cycle_errors = Counter("publisher_cycle_errors_total", "Publishing cycles that failed.")
+lessons_published = Counter("publisher_lessons_published_total", "Lessons published by the worker.")
+programs_published = Counter("publisher_programs_published_total", "Programs auto-published by the worker.")
+publish_lag = Histogram(
+    "publisher_lag_seconds", "How late lessons went live: published_at - publish_at.", buckets=LAG_BUCKETS
+)
@@ -0,0 +1,37 @@
+# backend/app/migrations.py
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from app.database import engine
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# pg_advisory_xact_lock key serializing upgrades across processes (any constant
+# unique within the database)
+MIGRATION_LOCK_ID = 7_316_040_001
+
+
+def alembic_config():
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    # Keep the app's logging setup; alembic.ini would otherwise reconfigure it
+    config.attributes["skip_logging"] = True
+    return config
+
+
+def run_migrations(revision="head"):
+    """Bring the database schema up to `revision` (used on startup and by seed_data).
+
+    On PostgreSQL the upgrade runs in one transaction holding an advisory lock,
+    so gunicorn workers starting together take turns: the first one migrates,
+    the rest find the schema already at head.
+    """
+    config = alembic_config()
+    if engine.dialect.name != "postgresql":
+        command.upgrade(config, revision)
+        return
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        # env.py migrates on this connection, inside the locked transaction
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import (
+    inspect,
     Column,
     String,
     Enum,
@@ -10,6 +11,9 @@ from sqlalchemy import (
     JSON,
     Integer,
     Text,
+    Index,
+    text,
+    update,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ARRAY
@@ -20,6 +24,12 @@ import uuid
 def gen_uuid():
     return str(uuid.uuid4())
 
+
+def column_values(obj):
+    """Plain dict of an ORM row's column attributes (no relationships)."""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
 # ---------- Compatibility Helper ----------
 def ArrayType(item_type=String):
     """Uses ARRAY for PostgreSQL, JSON fallback for SQLite."""
@@ -72,10 +82,21 @@ class Program(Base):
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Legacy; artwork lives in program_assets (see app.assets)
     poster_assets_by_language = Column(JSON, default={})
     # Relationships
     lessons = relationship("Lesson", back_populates="program", cascade="all, delete-orphan")
-    terms = relationship("Term", back_populates="program", cascade="all, delete-orphan")
+    terms = relationship(
+        "Term", back_populates="program", cascade="all, delete-orphan", order_by="Term.term_number"
+    )
+    program_assets = relationship("ProgramAsset", back_populates="program", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Catalog listing: WHERE status = ... ORDER BY published_at, id
+        Index("ix_programs_status_published_at", "status", "published_at", "id"),
+        # CMS listing: ORDER BY created_at, id
+        Index("ix_programs_created_at", "created_at", "id"),
+    )
 
     def __repr__(self):
         return f"<Program(title={self.title}, status={self.status})>"
@@ -90,16 +111,37 @@ class Term(Base):
     term_number = Column(Integer, nullable=False)
     title = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Per-term lesson number sequence; advanced atomically by reserve_lesson_numbers()
+    next_lesson_number = Column(Integer, nullable=False, default=1, server_default="1")
 
     program = relationship("Program", back_populates="terms")
-    lessons = relationship("Lesson", back_populates="term", cascade="all, delete-orphan")
+    lessons = relationship(
+        "Lesson", back_populates="term", cascade="all, delete-orphan", order_by="Lesson.lesson_number"
+    )
 
     __table_args__ = (
+        Index("ix_terms_program_id", "program_id"),
         # Unique constraint per program term
         {"sqlite_autoincrement": True},
     )
 
 
+def reserve_lesson_numbers(db, term_id, count=1):
+    """Atomically claim `count` consecutive lesson numbers in a term; returns the first.
+
+    A single UPDATE ... RETURNING on the term row: concurrent callers queue on
+    that row lock and always get disjoint ranges, without counting lessons.
+    """
+    next_number = db.execute(
+        update(Term)
+        .where(Term.id == term_id)
+        .values(next_lesson_number=Term.next_lesson_number + count)
+        .returning(Term.next_lesson_number)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    return next_number - count
+
+
 # ---------- Lesson ----------
 class Lesson(Base):
     __tablename__ = "lessons"
@@ -122,7 +164,7 @@ class Lesson(Base):
     subtitle_languages = Column(ArrayType(String), default=[])
     subtitle_urls_by_language = Column(JSON, default={})
 
-    # Media assets
+    # Legacy artwork blobs (this and thumbnail_assets_by_language); artwork lives in lesson_assets
     assets = Column(JSON, default={})  # e.g. { "en": { "portrait": "url", "landscape": "url" } }
 
     # Publishing workflow
@@ -137,6 +179,25 @@ class Lesson(Base):
     # Relationships
     program = relationship("Program", back_populates="lessons")
     term = relationship("Term", back_populates="lessons")
+    # Rows of lesson_assets (`assets` above is the legacy JSON column)
+    lesson_assets = relationship("LessonAsset", back_populates="lesson", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Worker scans: WHERE status = 'scheduled' AND publish_at <= now
+        Index("ix_lessons_status_publish_at", "status", "publish_at"),
+        # Partial index of just the queued lessons (next-due lookups)
+        Index(
+            "ix_lessons_scheduled_publish_at",
+            "publish_at",
+            postgresql_where=text("status = 'scheduled'"),
+            sqlite_where=text("status = 'scheduled'"),
+        ),
+        # Catalog/program reads: WHERE program_id = ... AND status = ... ORDER BY lesson_number
+        Index("ix_lessons_program_status_number", "program_id", "status", "lesson_number"),
+        Index("ix_lessons_term_id", "term_id"),
+        # Lesson numbers never repeat within a term
+        Index("uq_lessons_term_lesson_number", "term_id", "lesson_number", unique=True),
+    )
 
     def __repr__(self):
         return f"<Lesson(title={self.title}, status={self.status})>"
@@ -152,7 +213,13 @@ class ProgramAsset(Base):
     asset_type = Column(Enum(AssetTypeEnum), nullable=False)
     url = Column(String, nullable=False)
 
-    program = relationship("Program")
+    program = relationship("Program", back_populates="program_assets")
+
+    __table_args__ = (
+        # One URL per owner/language/type/variant; also serves per-language lookups
+        Index("uq_program_assets_owner_language_type_variant",
+              "program_id", "language", "asset_type", "variant", unique=True),
+    )
 
 # ---------- LessonAsset ----------
 class LessonAsset(Base):
@@ -165,6 +232,36 @@ class LessonAsset(Base):
     asset_type = Column(Enum(AssetTypeEnum), nullable=False)
     url = Column(String, nullable=False)
 
-    lesson = relationship("Lesson")
+    lesson = relationship("Lesson", back_populates="lesson_assets")
+
+    __table_args__ = (
+        Index("uq_lesson_assets_owner_language_type_variant",
+              "lesson_id", "language", "asset_type", "variant", unique=True),
+    )
 
 
+# ---------- CatalogEntry ----------
+class CatalogEntry(Base):
+    """Denormalized catalog read model; maintained by app.catalog_projection."""
+    __tablename__ = "catalog_entries"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    program_id = Column(String, nullable=False)
+    # The program's id on program rows, the lesson's id on lesson rows
+    entry_id = Column(String, nullable=False)
+    entry_type = Column(String, nullable=False)  # "program" or "lesson"
+    language = Column(String, nullable=False)
+    is_primary = Column(Boolean, nullable=False, default=False)
+    position = Column(Integer, nullable=False, default=0)  # 0 for the program row, else the lesson number
+    published_at = Column(DateTime, nullable=True)  # the program's, for listing order
+    payload = Column(JSON, nullable=False)  # response body with URLs/assets resolved for `language`
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("uq_catalog_entries_entry_language", "entry_id", "language", unique=True),
+        # Listing: WHERE entry_type = 'program' AND language = ... ORDER BY published_at, program_id
+        Index("ix_catalog_entries_listing", "entry_type", "language", "published_at", "program_id"),
+        Index("ix_catalog_entries_primary_listing", "entry_type", "is_primary", "published_at", "program_id"),
+        # Program page: WHERE program_id = ... AND language = ... ORDER BY position
+        Index("ix_catalog_entries_program", "program_id", "language", "position"),
+    )
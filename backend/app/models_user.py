@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String
 from sqlalchemy.dialects.sqlite import BLOB
 from app.database import Base
 import uuid
@@ -9,3 +9,5 @@ class User(Base):
     username = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(String, nullable=False)
+    # Bumped to revoke every token issued so far (tokens carry it as "ver")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
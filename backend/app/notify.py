@@ -0,0 +1,139 @@
+# backend/app/notify.py
+"""Signals between processes: web workers and the standalone publisher.
+
+On PostgreSQL these ride LISTEN/NOTIFY:
+  - SCHEDULE_CHANNEL wakes publisher loops when a schedule changes, so a
+    standalone `python -m app.worker` doesn't sleep until its idle cap;
+  - CATALOG_CHANNEL carries catalog cache invalidations, so a lesson published
+    by the worker (or a CMS write in another gunicorn worker) evicts every
+    process's cache, not just the writer's.
+
+Other databases (SQLite) have no equivalent; there the standalone worker polls
+every WORKER_POLL_SECONDS and web processes cap the catalog cache TTL at
+STANDALONE_CATALOG_TTL_SECONDS instead (see app.main / app.worker).
+"""
+import json
+import os
+import select
+import threading
+import time
+from sqlalchemy import text
+from app import cache
+from app.database import engine
+
+SCHEDULE_CHANNEL = "cms_schedule_changed"
+CATALOG_CHANNEL = "cms_catalog_changed"
+
+# pg_notify payloads must stay under 8000 bytes; larger invalidations clear everything
+MAX_PAYLOAD_BYTES = 7900
+# Pause before reconnecting a listener whose connection dropped
+RECONNECT_SECONDS = float(os.getenv("NOTIFY_RECONNECT_SECONDS", "5"))
+
+_started = False
+
+
+def supported():
+    return engine.dialect.name == "postgresql"
+
+
+def publish(channel, payload=""):
+    """Send a notification on its own short transaction; no-op off PostgreSQL.
+
+    Failures are logged, not raised: the caller's write is already committed.
+    """
+    if not supported():
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+    except Exception as e:
+        print(f"[Notify]- Error sending {channel}: {e}")
+
+
+def _publish_invalidation(program_ids, listing):
+    payload = json.dumps({"programs": sorted(program_ids), "listing": listing})
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps({"programs": None})
+    publish(CATALOG_CHANNEL, payload)
+
+
+def _evict(payload):
+    message = json.loads(payload or "{}")
+    if message.get("programs") is None:
+        cache.catalog_cache.clear()
+    else:
+        cache.evict_catalog(message["programs"], message.get("listing", False))
+
+
+def _listen_once(handlers):
+    """Dispatch notifications on one dedicated connection until it fails."""
+    # A dedicated connection, detached so it doesn't hold a pool slot
+    pooled = engine.raw_connection()
+    pooled.detach()
+    conn = pooled.driver_connection
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for channel in handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        print(f"[Notify] Listening on {', '.join(handlers)}.")
+        while True:
+            if select.select([conn], [], [], 60) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                note = conn.notifies.pop(0)
+                try:
+                    handlers[note.channel](note.payload)
+                except Exception as e:
+                    print(f"[Notify]- Error handling {note.channel}: {e}")
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _can_listen():
+    # poll()/notifies are psycopg2's API; any other driver would fail on every
+    # reconnect, so refuse once (app.database pins psycopg2 for postgresql:// URLs)
+    if engine.dialect.driver == "psycopg2":
+        return True
+    print(f"[Notify]- LISTEN needs the psycopg2 driver, not {engine.dialect.driver}; not listening.")
+    return False
+
+
+def _listen(handlers):
+    """Dispatch notifications to handlers[channel](payload) forever, reconnecting on errors."""
+    if not _can_listen():
+        return
+    while True:
+        try:
+            _listen_once(handlers)
+        except Exception as e:
+            print(f"[Notify]- Listener error: {e}; reconnecting in {RECONNECT_SECONDS:.0f}s")
+            time.sleep(RECONNECT_SECONDS)
+
+
+def start(on_schedule_changed=None, catalog=True):
+    """Publish this process's catalog invalidations and listen for the other processes'.
+
+    on_schedule_changed, if given, is called whenever another process changes
+    a schedule. Returns False (and does nothing) off PostgreSQL or when the
+    driver can't listen.
+    """
+    global _started
+    if not supported() or not _can_listen():
+        return False
+    if _started:
+        return True
+    _started = True
+    handlers = {}
+    if catalog:
+        cache.invalidation_publishers.append(_publish_invalidation)
+        handlers[CATALOG_CHANNEL] = _evict
+    if on_schedule_changed is not None:
+        handlers[SCHEDULE_CHANNEL] = lambda payload: on_schedule_changed()
+    if handlers:
+        threading.Thread(target=_listen, args=(handlers,), name="notify-listener", daemon=True).start()
+    return True
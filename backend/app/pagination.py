@@ -0,0 +1,81 @@
+# backend/app/pagination.py
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(timestamp, row_id):
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def projected_columns(model, fields):
+    """Columns for a `fields=a,b,c` projection; every column when `fields` is empty."""
+    columns = model.__table__.columns
+    if not fields:
+        return list(columns)
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [columns[name] for name in names]
+
+
+def keyset_order(stmt, sort_column, id_column, cursor=None):
+    """`stmt` ordered newest first on (sort_column, id_column), starting after `cursor`."""
+    if cursor:
+        stmt = stmt.where(tuple_(sort_column, id_column) < decode_cursor(cursor))
+    return stmt.order_by(sort_column.desc(), id_column.desc())
+
+
+def keyset_page(db, stmt, columns, sort_column, id_column, cursor=None,
+                limit=DEFAULT_PAGE_SIZE, include_total=True):
+    """Fetch one page of `stmt`, newest first, keyed on (sort_column, id_column).
+
+    Only `columns` are loaded. Returns (rows, next_cursor, total); total is
+    None when include_total is False so callers can skip the count scan.
+    """
+    total = None
+    if include_total:
+        total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+    # The sort key is always loaded so the next cursor can be built
+    selected = {c.key for c in columns}
+    extra = [c for c in (sort_column, id_column) if c.key not in selected]
+    page_stmt = keyset_order(
+        stmt.with_only_columns(*columns, *extra), sort_column, id_column, cursor
+    ).limit(limit + 1)
+
+    rows = [dict(row) for row in db.execute(page_stmt).mappings()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[sort_column.key], last[id_column.key])
+    for row in rows:
+        for column in extra:
+            row.pop(column.key, None)
+    return rows, next_cursor, total
+
+
+def page_headers(next_cursor, total):
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return headers
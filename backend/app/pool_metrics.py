@@ -0,0 +1,125 @@
+# backend/app/pool_metrics.py
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool, updated from pool events."""
+
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connections_opened = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.age_seconds_total = 0.0
+        self.age_seconds_max = 0.0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        connection_record.info["opened_at"] = time.monotonic()
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        age = time.monotonic() - connection_record.info.get("opened_at", time.monotonic())
+        with self._lock:
+            self.checkouts += 1
+            self.age_seconds_total += age
+            self.age_seconds_max = max(self.age_seconds_max, age)
+            self.peak_checked_out = max(self.peak_checked_out, self._checked_out())
+            self.peak_overflow = max(self.peak_overflow, self._overflow())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _checked_out(self):
+        return self.pool.checkedout() if hasattr(self.pool, "checkedout") else self.checkouts - self.checkins
+
+    def _overflow(self):
+        return max(self.pool.overflow(), 0) if hasattr(self.pool, "overflow") else 0
+
+    def snapshot(self):
+        with self._lock:
+            checkouts = self.checkouts or 1
+            return {
+                "pool": type(self.pool).__name__,
+                "size": self.pool.size() if hasattr(self.pool, "size") else None,
+                "checked_out": self._checked_out(),
+                "overflow": self._overflow(),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": self.checkouts,
+                "connections_opened": self.connections_opened,
+                "checkout_wait_ms_avg": round(self.wait_seconds_total / checkouts * 1000, 3),
+                "checkout_wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "connection_age_s_avg": round(self.age_seconds_total / checkouts, 1),
+                "connection_age_s_max": round(self.age_seconds_max, 1),
+            }
+
+
+def instrumented_pool_class(base, metrics):
+    """Subclass of pool class `base` that times every checkout (queueing, connect and pre-ping)."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return base.connect(self)
+        finally:
+            metrics.record_wait(time.perf_counter() - start)
+
+    # recreate() (e.g. after engine.dispose()) reuses self.__class__, so timing survives it
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
+
+
+def instrumented_pool(url, metrics):
+    """`poolclass` for create_engine(url): the pool the dialect would pick, with checkouts timed."""
+    url = make_url(url)
+    return instrumented_pool_class(url.get_dialect().get_pool_class(url), metrics)
+
+
+def attach_pool_metrics(engine, metrics):
+    """Feed `metrics` from the pool events of `engine` (built with instrumented_pool())."""
+    metrics.pool = engine.pool
+    event.listen(engine, "connect", metrics._on_connect)
+    event.listen(engine, "checkout", metrics._on_checkout)
+    event.listen(engine, "checkin", metrics._on_checkin)
+    # Keep pointing at the live pool if the engine recreates it
+    event.listen(engine, "engine_disposed", lambda e: setattr(metrics, "pool", e.pool))
+    return metrics
+
+
+class SessionMetrics:
+    """How long request-scoped sessions stay open."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions = 0
+        self.open_seconds_total = 0.0
+        self.open_seconds_max = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.sessions += 1
+            self.open_seconds_total += seconds
+            self.open_seconds_max = max(self.open_seconds_max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "sessions": self.sessions,
+                "open_ms_avg": round(self.open_seconds_total / (self.sessions or 1) * 1000, 3),
+                "open_ms_max": round(self.open_seconds_max * 1000, 3),
+            }
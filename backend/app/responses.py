@@ -0,0 +1,14 @@
+# backend/app/responses.py
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for payloads built by hand.
+
+    Routes with a response_model don't need it: FastAPI dumps those through
+    Pydantic's serializer directly.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
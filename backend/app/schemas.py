@@ -0,0 +1,131 @@
+# backend/app/schemas.py
+"""Response models for the CMS routes, validated straight from ORM rows."""
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from app.models_program import AssetTypeEnum, AssetVariantEnum, ContentTypeEnum, StatusEnum
+
+
+class ORMModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ---------- Assets ----------
+class ProgramAssetOut(ORMModel):
+    id: str
+    program_id: str
+    language: str
+    variant: AssetVariantEnum
+    asset_type: AssetTypeEnum
+    url: str
+
+
+class LessonAssetOut(ORMModel):
+    id: str
+    lesson_id: str
+    language: str
+    variant: AssetVariantEnum
+    asset_type: AssetTypeEnum
+    url: str
+
+
+# ---------- Program / Term / Lesson ----------
+class ProgramOut(ORMModel):
+    id: str
+    title: str
+    description: str | None = None
+    language_primary: str
+    languages_available: list[str] | None = None
+    status: StatusEnum | None = None
+    published_at: datetime | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    poster_assets_by_language: dict | None = None
+
+
+class LessonOut(ORMModel):
+    id: str
+    program_id: str
+    term_id: str | None = None
+    lesson_number: int
+    title: str
+    content_type: ContentTypeEnum | None = None
+    duration_ms: int | None = None
+    is_paid: bool | None = None
+    content_language_primary: str
+    content_languages_available: list[str] | None = None
+    content_urls_by_language: dict | None = None
+    subtitle_languages: list[str] | None = None
+    subtitle_urls_by_language: dict | None = None
+    assets: dict | None = None
+    status: StatusEnum | None = None
+    publish_at: datetime | None = None
+    published_at: datetime | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    thumbnail_assets_by_language: dict | None = None
+
+
+class TermOut(ORMModel):
+    id: str
+    program_id: str
+    term_number: int
+    title: str | None = None
+    created_at: datetime | None = None
+    next_lesson_number: int
+
+
+# ---------- Program details tree ----------
+class LessonDetailOut(LessonOut):
+    lesson_assets: list[LessonAssetOut] = []
+
+
+class TermDetailOut(TermOut):
+    lessons: list[LessonDetailOut] = []
+
+
+class ProgramDetailOut(ProgramOut):
+    program_assets: list[ProgramAssetOut] = []
+
+
+class ProgramDetailsResponse(BaseModel):
+    program: ProgramDetailOut
+    terms: list[TermDetailOut]
+    lessons: list[LessonDetailOut]
+
+
+# ---------- Envelopes ----------
+class MessageResponse(BaseModel):
+    message: str
+
+
+class ProgramMessageResponse(MessageResponse):
+    program: ProgramOut
+
+
+class LessonMessageResponse(MessageResponse):
+    lesson: LessonOut
+
+
+class BulkImportError(BaseModel):
+    row: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[BulkImportError]
+
+
+class LessonBatchResult(BaseModel):
+    id: str
+    ok: bool
+    status: StatusEnum | None = None
+    error: str | None = None
+
+
+class LessonBatchResponse(BaseModel):
+    action: str
+    succeeded: int
+    failed: int
+    results: list[LessonBatchResult]
@@ -0,0 +1,164 @@
+# backend/app/search.py
+"""Full-text search over published programs and lessons.
+
+PostgreSQL: GIN indexes on to_tsvector() expressions of the base tables, so
+status changes are reflected without extra writes. SQLite: an FTS5 table,
+`search_index`, kept in sync by app.catalog_projection on every publish/archive;
+its rows are located by rowid through `search_index_rows` (entity and program
+ids are UNINDEXED in FTS5). Created by migrations 0006 and 0009.
+"""
+import re
+from sqlalchemy import bindparam, text
+
+# Objects created by the migration rather than declared on the models;
+# alembic autogenerate skips names with this prefix.
+SEARCH_OBJECT_PREFIX = "search_"
+SEARCH_TABLE = "search_index"
+SEARCH_ROWS_TABLE = "search_index_rows"
+# Language-neutral config: the catalog mixes languages (en, hi, ...)
+TS_CONFIG = "simple"
+
+
+def program_document(alias=""):
+    """tsvector of a program; must match the search_programs_document index expression."""
+    return f"to_tsvector('{TS_CONFIG}', coalesce({alias}title, '') || ' ' || coalesce({alias}description, ''))"
+
+
+def lesson_document(alias=""):
+    """tsvector of a lesson; must match the search_lessons_document index expression."""
+    return f"to_tsvector('{TS_CONFIG}', coalesce({alias}title, ''))"
+
+
+_PG_SEARCH = text(f"""
+    SELECT entity_type, id, program_id, title, rank FROM (
+        SELECT 'program' AS entity_type, p.id, p.id AS program_id, p.title,
+               ts_rank({program_document("p.")}, tsq) AS rank
+        FROM programs p, websearch_to_tsquery('{TS_CONFIG}', :q) tsq
+        WHERE p.status = 'published' AND {program_document("p.")} @@ tsq
+        UNION ALL
+        SELECT 'lesson', l.id, l.program_id, l.title, ts_rank({lesson_document("l.")}, tsq)
+        FROM lessons l JOIN programs lp ON lp.id = l.program_id,
+             websearch_to_tsquery('{TS_CONFIG}', :q) tsq
+        WHERE l.status = 'published' AND lp.status = 'published' AND {lesson_document("l.")} @@ tsq
+    ) hits
+    ORDER BY rank DESC, id
+    LIMIT :limit OFFSET :offset
+""")
+
+_SQLITE_SEARCH = text(f"""
+    SELECT entity_type, entity_id AS id, program_id, title, -bm25({SEARCH_TABLE}) AS rank
+    FROM {SEARCH_TABLE}
+    WHERE {SEARCH_TABLE} MATCH :q
+    ORDER BY rank DESC, id
+    LIMIT :limit OFFSET :offset
+""")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_query(q):
+    """User input as an FTS5 query: every word must match, as a prefix."""
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(q))
+
+
+def _dialect(db):
+    return db.get_bind().dialect.name
+
+
+def search(db, q, limit, offset=0):
+    """Ranked matches, best first: [{"type", "id", "program_id", "title", "rank"}]."""
+    if _dialect(db) == "sqlite":
+        q = _fts5_query(q)
+        if not q:
+            return []
+        stmt = _SQLITE_SEARCH
+    else:
+        stmt = _PG_SEARCH
+    rows = db.execute(stmt, {"q": q, "limit": limit, "offset": offset}).mappings()
+    return [
+        {
+            "type": row["entity_type"],
+            "id": row["id"],
+            "program_id": row["program_id"],
+            "title": row["title"],
+            "rank": float(row["rank"]),
+        }
+        for row in rows
+    ]
+
+
+def index_programs(db, program_ids, programs, lessons):
+    """Replace the SQLite FTS rows of `program_ids` with the given published programs/lessons.
+
+    No-op on PostgreSQL, whose expression indexes follow the base tables.
+    """
+    if _dialect(db) != "sqlite" or not program_ids:
+        return
+    _delete_rows(db, "program_id", program_ids)
+    _insert_rows(db, [_program_row(p) for p in programs] + [_lesson_row(l) for l in lessons])
+
+
+def index_lessons(db, lesson_ids, lessons):
+    """Replace the SQLite FTS rows of `lesson_ids` with the given published lessons."""
+    if _dialect(db) != "sqlite" or not lesson_ids:
+        return
+    _delete_rows(db, "entity_id", lesson_ids)
+    _insert_rows(db, [_lesson_row(l) for l in lessons])
+
+
+def _program_row(program):
+    return {
+        "type": "program", "id": program.id, "program_id": program.id,
+        "title": program.title, "body": program.description or "",
+    }
+
+
+def _lesson_row(lesson):
+    return {"type": "lesson", "id": lesson.id, "program_id": lesson.program_id, "title": lesson.title, "body": ""}
+
+
+def _delete_rows(db, column, ids):
+    """Drop FTS rows (by rowid) and their mappings whose `column` is in `ids`."""
+    params = {"ids": list(ids)}
+    db.execute(
+        text(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+            f"(SELECT fts_rowid FROM {SEARCH_ROWS_TABLE} WHERE {column} IN :ids)"
+        ).bindparams(bindparam("ids", expanding=True)),
+        params,
+    )
+    db.execute(
+        text(f"DELETE FROM {SEARCH_ROWS_TABLE} WHERE {column} IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        params,
+    )
+
+
+def _insert_rows(db, rows):
+    """Add FTS rows and their rowid mappings (SQLite writers are serialized, so max+n is safe)."""
+    if not rows:
+        return
+    last = db.execute(text(f"SELECT coalesce(max(fts_rowid), 0) FROM {SEARCH_ROWS_TABLE}")).scalar()
+    for n, row in enumerate(rows, 1):
+        row["rowid"] = last + n
+    db.execute(
+        text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, entity_type, entity_id, program_id, title, body) "
+            "VALUES (:rowid, :type, :id, :program_id, :title, :body)"
+        ),
+        rows,
+    )
+    db.execute(
+        text(
+            f"INSERT INTO {SEARCH_ROWS_TABLE} (fts_rowid, entity_id, program_id) "
+            "VALUES (:rowid, :id, :program_id)"
+        ),
+        rows,
+    )
+
+
+def clear_search_index(db):
+    if _dialect(db) == "sqlite":
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+        db.execute(text(f"DELETE FROM {SEARCH_ROWS_TABLE}"))
@@ -0,0 +1,46 @@
+# backend/app/streaming.py
+import os
+import orjson
+from fastapi.responses import StreamingResponse
+from app.database import SessionLocal
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+
+NDJSON = "ndjson"
+JSON_ARRAY = "json"
+STREAM_MEDIA_TYPES = {NDJSON: "application/x-ndjson", JSON_ARRAY: "application/json"}
+
+
+def _encode_rows(stmt, render, mode, batch_size):
+    """Run `stmt` on its own session and yield encoded output one batch at a time.
+
+    With yield_per the driver uses a server-side cursor where it has one
+    (psycopg2), so only `batch_size` rows are held in memory at once.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        first = True
+        if mode == JSON_ARRAY:
+            yield b"["
+        for rows in result.partitions():
+            encoded = [orjson.dumps(render(row)) for row in rows]
+            if mode == NDJSON:
+                yield b"\n".join(encoded) + b"\n"
+            else:
+                yield (b"" if first else b",") + b",".join(encoded)
+            first = False
+        if mode == JSON_ARRAY:
+            yield b"]"
+    finally:
+        db.close()
+
+
+def stream_rows(stmt, render, mode, batch_size=STREAM_BATCH_SIZE):
+    """StreamingResponse of `render(row)` for every row of `stmt`, as NDJSON or a JSON array.
+
+    The body is produced in a worker thread on a session of its own, so the
+    request's session is not held open for the whole transfer.
+    """
+    return StreamingResponse(_encode_rows(stmt, render, mode, batch_size), media_type=STREAM_MEDIA_TYPES[mode])
@@ -0,0 +1,102 @@
+import codecs
+import json
+
+# A single row larger than this is rejected instead of buffering indefinitely.
+MAX_ROW_BYTES = 1024 * 1024
+
+
+async def iter_json_rows(chunks, line_delimited, max_row_bytes=MAX_ROW_BYTES):
+    """Incrementally parse a request body into rows.
+
+    `chunks` is an async iterator of bytes (e.g. `request.stream()`). The body is
+    either NDJSON (`line_delimited=True`) or a JSON array of objects. Yields
+    `(row_number, value, error)` tuples; only the current row is ever buffered.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    rows = _ndjson_rows(max_row_bytes) if line_delimited else _array_rows(max_row_bytes)
+    next(rows)
+    async for chunk in chunks:
+        for item in rows.send(decoder.decode(chunk)):
+            yield item
+    tail = decoder.decode(b"", final=True)
+    for item in (rows.send(tail) if tail else []) + rows.send(None):
+        yield item
+
+
+def _ndjson_rows(max_row_bytes):
+    """Coroutine: send text chunks (None at EOF), receive the rows they completed."""
+    buffer, row_number, skipping, out = "", 0, False, []
+    while True:
+        text = yield out
+        out = []
+        eof = text is None
+        # Only the new text is split; the pending partial line joins its first piece
+        lines = (text or "").split("\n")
+        lines[0] = buffer + lines[0]
+        buffer = "" if eof else lines.pop()
+        if skipping:
+            if lines:
+                # The rest of an oversized row ends here
+                lines.pop(0)
+                skipping = False
+            else:
+                buffer = ""
+        for line in lines:
+            if not line.strip():
+                continue
+            row_number += 1
+            if len(line) > max_row_bytes:
+                out.append((row_number, None, f"Row exceeds {max_row_bytes} bytes"))
+                continue
+            try:
+                out.append((row_number, json.loads(line), None))
+            except json.JSONDecodeError as e:
+                out.append((row_number, None, f"Invalid JSON: {e.msg}"))
+        if len(buffer) > max_row_bytes:
+            row_number += 1
+            out.append((row_number, None, f"Row exceeds {max_row_bytes} bytes"))
+            buffer, skipping = "", True
+
+
+def _array_rows(max_row_bytes):
+    """Coroutine: like _ndjson_rows, for a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buffer, row_number, started, done, out = "", 0, False, False, []
+    while True:
+        text = yield out
+        out = []
+        eof = text is None
+        buffer += text or ""
+        pos = 0
+        while not done:
+            # Skip whitespace and separators between values
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    out.append((1, None, "Body must be a JSON array or NDJSON"))
+                    done = True
+                    break
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                done = True
+                break
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Most likely the row continues in the next chunk
+                if not eof and len(buffer) - pos < max_row_bytes:
+                    break
+                out.append((row_number + 1, None, f"Invalid JSON: {e.msg}"))
+                done = True
+                break
+            row_number += 1
+            out.append((row_number, value, None))
+            pos = end
+        buffer = "" if done else buffer[pos:]
+        if eof and started and not done:
+            out.append((row_number + 1, None, "Unterminated JSON array"))
@@ -1,76 +1,289 @@
+import argparse
+import os
+import signal
+import threading
 import time
-from datetime import datetime, timezone
-from sqlalchemy import and_
+from datetime import datetime
+from prometheus_client import start_http_server
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import and_, func, select, update
+from app.cache import invalidate_catalog
+from app.catalog_projection import refresh_lessons, refresh_programs
+from app import metrics, notify
 from app.database import SessionLocal
 from app.models_program import Program, Lesson, StatusEnum
 
+# Max lessons flipped per transaction; keeps each commit short during release waves.
+PUBLISH_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", "500"))
+# Upper bound on an idle sleep, so schedules written by other processes are still picked up.
+MAX_IDLE_SECONDS = float(os.getenv("WORKER_MAX_IDLE_SECONDS", "300"))
+# Idle cap of a standalone worker that can't be woken by NOTIFY (non-PostgreSQL, see app.notify).
+POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "5"))
+# Back-off when lessons are still due right after a cycle (e.g. the cycle failed).
+RETRY_SECONDS = float(os.getenv("WORKER_RETRY_SECONDS", "1"))
+# Publisher loops run by `python -m app.worker` (batches are leased, so they never overlap).
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+# Port for the standalone service's Prometheus endpoint (0 = off); the web app serves /metrics itself.
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
 
-def run_worker_once():
-    """Run one background publishing cycle."""
+# Set whenever a schedule changes in this process; wakes the scheduler early.
+_schedule_changed = threading.Event()
+# Set on shutdown; loops exit once their current batch is committed.
+_stop = threading.Event()
+
+
+def wake_publisher():
+    """Wake this process's publisher loops only (the NOTIFY handler, see app.notify)."""
+    _schedule_changed.set()
+
+
+def notify_schedule_changed():
+    """Wake the scheduler (here, and in other processes on PostgreSQL) so it re-reads the next due time."""
+    _schedule_changed.set()
+    notify.publish(notify.SCHEDULE_CHANNEL)
+
+
+def request_stop():
+    """Ask every publisher loop in this process to stop after its current batch."""
+    _stop.set()
+    _schedule_changed.set()
+
+
+def next_publish_at(db):
+    """Earliest publish_at among scheduled lessons, or None if nothing is queued."""
+    return db.execute(
+        select(func.min(Lesson.publish_at)).where(Lesson.status == StatusEnum.scheduled)
+    ).scalar()
+
+
+def supports_skip_locked(db):
+    """Row leasing via FOR UPDATE SKIP LOCKED is only used on PostgreSQL."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def publish_due_batch(db, now, batch_size=PUBLISH_BATCH_SIZE):
+    """Publish up to `batch_size` due lessons and their programs in one transaction.
+
+    Safe to run from several processes at once: on PostgreSQL the chunk is
+    claimed with FOR UPDATE SKIP LOCKED, so concurrent publishers take
+    disjoint rows instead of queueing on the same ones. Other backends
+    (SQLite) serialize writers on the database lock. In both cases the
+    UPDATE re-checks status='scheduled', so each lesson is flipped and
+    returned exactly once.
+
+    Returns (lessons_published, program_ids_published).
+    """
+    due_ids = (
+        select(Lesson.id)
+        .where(
+            and_(
+                Lesson.status == StatusEnum.scheduled,
+                Lesson.publish_at <= now,
+            )
+        )
+        .order_by(Lesson.publish_at)
+        .limit(batch_size)
+    )
+    if supports_skip_locked(db):
+        due_ids = due_ids.with_for_update(skip_locked=True)
+
+    # Step 1: Flip the chunk of due lessons in a single statement
+    rows = db.execute(
+        update(Lesson)
+        .where(Lesson.id.in_(due_ids.scalar_subquery()), Lesson.status == StatusEnum.scheduled)
+        .values(status=StatusEnum.published, published_at=now)
+        .returning(Lesson.id, Lesson.program_id, Lesson.publish_at)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    if not rows:
+        db.commit()
+        return 0, []
+
+    # Step 2: Auto-publish every affected parent program with one grouped statement
+    program_ids = {row.program_id for row in rows}
+    published_programs = db.execute(
+        update(Program)
+        .where(Program.id.in_(program_ids), Program.status != StatusEnum.published)
+        .values(status=StatusEnum.published, published_at=now)
+        .returning(Program.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    # Step 3: Re-project into the catalog read model: whole programs that just
+    # went live, only the new lessons elsewhere
+    went_live = set(published_programs)
+    refresh_programs(db, went_live)
+    refresh_lessons(db, [row.id for row in rows if row.program_id not in went_live])
+
+    db.commit()
+    invalidate_catalog(program_ids, listing=bool(published_programs))
+
+    metrics.lessons_published.inc(len(rows))
+    metrics.programs_published.inc(len(published_programs))
+    for row in rows:
+        metrics.publish_lag.observe((now - row.publish_at.replace(tzinfo=None)).total_seconds())
+    return len(rows), published_programs
+
+
+def run_worker_once(batch_size=PUBLISH_BATCH_SIZE):
+    """Run one background publishing cycle.
+
+    Returns {"lessons": <published lessons>, "programs": <auto-published programs>}.
+    """
     db = SessionLocal()
-    now = datetime.now(timezone.utc)
+    now = datetime.utcnow()
+    stats = {"lessons": 0, "programs": 0}
+    started = time.perf_counter()
 
     try:
         print(f"[Worker] Running at {now.isoformat()}...")
 
-        # Step 1: Find lessons scheduled for publishing
-        scheduled_lessons = (
-            db.query(Lesson)
-            .filter(
-                and_(
-                    Lesson.status == StatusEnum.scheduled,
-                    Lesson.publish_at <= now,
-                )
-            )
-            .all()
-        )
+        # Drain due lessons in bounded chunks, one short transaction each
+        while True:
+            lessons, program_ids = publish_due_batch(db, now, batch_size)
+            stats["lessons"] += lessons
+            stats["programs"] += len(program_ids)
+            if lessons < batch_size or _stop.is_set():
+                break
 
-        if not scheduled_lessons:
+        if not stats["lessons"]:
             print("[Worker] No lessons to publish.")
         else:
-            for lesson in scheduled_lessons:
-                print(f"[Worker] Publishing lesson: {lesson.title}")
-                lesson.status = StatusEnum.published
-                lesson.published_at = now
-                db.add(lesson)
-
-                # Step 2: Auto-publish parent program if needed
-                program = db.query(Program).filter(Program.id == lesson.program_id).first()
-                if program and program.status != StatusEnum.published:
-                    published_count = (
-                        db.query(Lesson)
-                        .filter(
-                            Lesson.program_id == program.id,
-                            Lesson.status == StatusEnum.published,
-                        )
-                        .count()
-                    )
-                    if published_count >= 1:
-                        print(f"[Worker] Auto-publishing program: {program.title}")
-                        program.status = StatusEnum.published
-                        program.published_at = now
-                        db.add(program)
-
-            db.commit()
-            print("[Worker]  Publishing cycle complete.")
+            print(
+                f"[Worker]  Publishing cycle complete: {stats['lessons']} lessons, "
+                f"{stats['programs']} programs published."
+            )
 
     except Exception as e:
         db.rollback()
+        metrics.publish_cycle_errors.inc()
         print(f"[Worker]- Error: {e}")
 
     finally:
         db.close()
+        metrics.publish_cycle_duration.observe(time.perf_counter() - started)
+
+    return stats
 
 
-def start_worker():
-    """Start infinite background worker loop."""
+def scheduled_lesson_counts(db, now):
+    """{"queued": all scheduled lessons, "due": those whose publish_at has passed}."""
+    queued, due = db.execute(
+        select(
+            func.count(Lesson.id),
+            func.count(Lesson.id).filter(Lesson.publish_at <= now),
+        ).where(Lesson.status == StatusEnum.scheduled)
+    ).one()
+    return {"queued": queued, "due": due}
+
+
+class QueueDepthCollector:
+    """publisher_scheduled_lessons{state="queued"|"due"}, counted in the DB at scrape time."""
+
+    def _family(self):
+        return GaugeMetricFamily(
+            "publisher_scheduled_lessons", "Scheduled lessons, all queued and those already due.", labels=["state"]
+        )
+
+    def describe(self):
+        # Lets the registry check names without running the query
+        yield self._family()
+
+    def collect(self):
+        family = self._family()
+        db = SessionLocal()
+        try:
+            for state, count in scheduled_lesson_counts(db, datetime.utcnow()).items():
+                family.add_metric([state], count)
+        except Exception as e:
+            print(f"[Metrics] Queue depth query failed: {e}")
+        finally:
+            db.close()
+        yield family
+
+
+metrics.REGISTRY.register(QueueDepthCollector())
+
+
+def seconds_until_next_publish(max_idle=MAX_IDLE_SECONDS):
+    """How long the scheduler may sleep before the next lesson becomes due."""
+    db = SessionLocal()
+    try:
+        due_at = next_publish_at(db)
+    except Exception as e:
+        print(f"[Worker]- Error reading next publish time: {e}")
+        return max_idle
+    finally:
+        db.close()
+
+    if due_at is None:
+        return max_idle
+    delay = (due_at.replace(tzinfo=None) - datetime.utcnow()).total_seconds()
+    return min(max(delay, 0.0), max_idle)
+
+
+def start_worker(batch_size=PUBLISH_BATCH_SIZE, max_idle=MAX_IDLE_SECONDS):
+    """Publisher loop: sleep until the next lesson is due, publish, repeat until stopped."""
     print("Starting background worker... (Press Ctrl+C to stop)")
-    while True:
-        run_worker_once()
-        time.sleep(60)  # check every 60 seconds
+    while not _stop.is_set():
+        _schedule_changed.clear()
+        run_worker_once(batch_size)
+        if _stop.is_set():
+            break
+        delay = seconds_until_next_publish(max_idle)
+        _schedule_changed.wait(timeout=delay or RETRY_SECONDS)
+    print("[Worker] Stopped.")
+
+
+run_scheduled_publisher = run_worker_once
+
+
+def main(argv=None):
+    """`python -m app.worker`: the publisher as its own service, separate from the web process."""
+    parser = argparse.ArgumentParser(description="Scheduled lesson publisher")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY,
+                        help="publisher loops to run (default: WORKER_CONCURRENCY or 1)")
+    parser.add_argument("--batch-size", type=int, default=PUBLISH_BATCH_SIZE,
+                        help="lessons per transaction (default: WORKER_BATCH_SIZE or 500)")
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    parser.add_argument("--metrics-port", type=int, default=WORKER_METRICS_PORT,
+                        help="serve Prometheus metrics on this port (default: WORKER_METRICS_PORT or off)")
+    args = parser.parse_args(argv)
+
+    if args.once:
+        run_worker_once(args.batch_size)
+        return
+
+    def handle_signal(signum, frame):
+        print(f"[Worker] Received {signal.Signals(signum).name}; finishing the current batch...")
+        request_stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    if args.metrics_port:
+        start_http_server(args.metrics_port)
+        print(f"[Metrics] Serving /metrics on port {args.metrics_port}")
+
+    # Web processes wake us and receive our cache invalidations over NOTIFY;
+    # without it, poll often so new schedules aren't missed for long
+    max_idle = MAX_IDLE_SECONDS
+    if not notify.start(on_schedule_changed=wake_publisher):
+        max_idle = min(MAX_IDLE_SECONDS, POLL_SECONDS)
+        print(f"[Worker] No cross-process wake-up on this database; polling every {max_idle:.0f}s.")
+
+    loops = [
+        threading.Thread(target=start_worker, args=(args.batch_size, max_idle), name=f"publisher-{n}")
+        for n in range(max(args.concurrency, 1))
+    ]
+    for loop in loops:
+        loop.start()
+    # Poll so the main thread stays free to run signal handlers
+    while any(loop.is_alive() for loop in loops):
+        for loop in loops:
+            loop.join(timeout=0.5)
 
 
-# --- Prevent auto-run when imported by FastAPI ---
 if __name__ == "__main__":
-    start_worker()
-run_scheduled_publisher = run_worker_once
\ No newline at end of file
+    main()
@@ -0,0 +1,312 @@
+"""Load test of the catalog, CMS and publisher hot paths against a synthetic catalog.
+
+    cd backend && python -m benchmarks.load [--programs 200] [--lessons-per-program 20]
+        [--database-url sqlite:///bench.db] [--uvicorn] [--requests 500] [--output results.json]
+
+Seeds `--programs` synthetic published programs with seed_data.seed()
+(10000 x 50 gives a 500k-lesson catalog; re-runs only add what is missing), then drives the app
+in-process through TestClient, or through a local uvicorn with --uvicorn.
+Reports p50/p99 latency, throughput and SQL statements per request for the
+catalog listing, catalog program detail and CMS add_lesson, plus the
+duration of run_worker_once() cycles. Results are written as JSON (default
+benchmarks/results/<timestamp>.json) so runs can be diffed.
+
+Needs httpx (`pip install httpx`).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+ADMIN = ("admin@cms.com", "admin123")
+
+
+# ---------- Measurement ----------
+def percentile(samples, pct):
+    """Nearest-rank percentile of `samples` (seconds), in milliseconds."""
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[rank] * 1000
+
+
+def summarize(samples, elapsed, errors=0):
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+    }
+
+
+_QUERY_SUM = re.compile(r'^db_queries_per_request_(sum|count)\{route="([^"]*)"\} (\S+)$', re.M)
+
+
+def query_counts(client):
+    """{route: (statements, requests)} as reported by the app's /metrics."""
+    totals = {}
+    for kind, route, value in _QUERY_SUM.findall(client.get("/metrics").text):
+        statements, requests = totals.get(route, (0.0, 0.0))
+        totals[route] = (float(value), requests) if kind == "sum" else (statements, float(value))
+    return totals
+
+
+def run_scenario(client, name, route, make_request, count, concurrency):
+    """Issue `count` requests (`make_request(client, i)` returns a response); stats plus queries/request."""
+    before = query_counts(client)
+
+    def timed(i):
+        start = time.perf_counter()
+        response = make_request(client, i)
+        return time.perf_counter() - start, response.status_code >= 400
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(count)))
+    elapsed = time.perf_counter() - started
+
+    result = summarize([seconds for seconds, _ in results], elapsed, sum(failed for _, failed in results))
+    after = query_counts(client)
+    statements = after.get(route, (0, 0))[0] - before.get(route, (0, 0))[0]
+    requests = after.get(route, (0, 0))[1] - before.get(route, (0, 0))[1]
+    result["queries_per_request"] = round(statements / requests, 2) if requests else None
+    print(
+        f"  {name:<16} p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+        f"{result['throughput_rps']:8.1f} req/s  {result['queries_per_request']} queries/req"
+    )
+    return result
+
+
+def catalog_pages(client, count):
+    """Cursors of the first `count` listing pages, so the listing scenario walks the catalog."""
+    cursors, cursor = [None], None
+    while len(cursors) < count:
+        response = client.get("/catalog/programs", params={"cursor": cursor} if cursor else {})
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        cursors.append(cursor)
+    return cursors
+
+
+def worker_cycles(cycles, lessons):
+    """Schedule `lessons` due lessons, then time one run_worker_once(); repeated `cycles` times."""
+    from sqlalchemy import event, select, update
+    from app.database import SessionLocal, engine
+    from app.models_program import Lesson, StatusEnum
+    from app.worker import run_worker_once
+
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    samples, published, queries = [], 0, []
+    for _ in range(cycles):
+        db = SessionLocal()
+        try:
+            ids = db.execute(
+                select(Lesson.id).where(Lesson.status == StatusEnum.published).order_by(Lesson.id).limit(lessons)
+            ).scalars().all()
+            db.execute(
+                update(Lesson)
+                .where(Lesson.id.in_(ids))
+                .values(status=StatusEnum.scheduled, publish_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        statements[0] = 0
+        event.listen(engine, "after_cursor_execute", count)
+        start = time.perf_counter()
+        stats = run_worker_once()
+        samples.append(time.perf_counter() - start)
+        event.remove(engine, "after_cursor_execute", count)
+        published += stats["lessons"]
+        queries.append(statements[0])
+
+    result = {
+        "cycles": cycles,
+        "lessons_per_cycle": lessons,
+        "lessons_published": published,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "lessons_per_second": round(published / sum(samples), 1),
+        "queries_per_cycle": round(sum(queries) / len(queries), 1),
+    }
+    print(
+        f"  {'worker cycle':<16} p50 {result['p50_ms']:8.2f} ms  max {result['max_ms']:8.2f} ms  "
+        f"{result['lessons_per_second']:8.1f} lessons/s  {result['queries_per_cycle']} queries/cycle"
+    )
+    return result
+
+
+# ---------- Drivers ----------
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn():
+    """A local uvicorn child serving app.main:app with this process's environment; returns (process, url)."""
+    import httpx
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def run(args):
+    from sqlalchemy import select
+    from app.auth import ensure_demo_users
+    from app.database import SessionLocal
+    from app.migrations import run_migrations
+    from app.models_program import Program, StatusEnum
+    from seed_data import seed
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        added = seed(db, args.programs, args.lessons_per_program)
+        print(f"[Bench] Seeded {added['programs']} programs, {added['lessons']} lessons "
+              f"in {time.perf_counter() - started:.1f}s")
+        # Before the app starts, so its background bootstrap finds the logins in place
+        ensure_demo_users(db)
+        program_ids = db.execute(
+            select(Program.id).where(Program.status == StatusEnum.published)
+        ).scalars().all()
+    finally:
+        db.close()
+    random.seed(args.seed)
+
+    process = None
+    if args.uvicorn:
+        import httpx
+
+        process, url = start_uvicorn()
+        client = httpx.Client(base_url=url, timeout=60)
+        driver = "uvicorn"
+    else:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        client = TestClient(app).__enter__()
+        driver = "in-process"
+
+    try:
+        token = client.post("/auth/login", json={"email": ADMIN[0], "password": ADMIN[1]}).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        cursors = catalog_pages(client, args.requests)
+        targets = random.choices(program_ids, k=args.requests)
+        print(f"[Bench] {driver}, {len(program_ids)} published programs, {args.requests} requests per scenario, "
+              f"concurrency {args.concurrency}")
+
+        scenarios = {
+            "catalog_list": run_scenario(
+                client, "catalog list", "/catalog/programs",
+                lambda c, i: c.get("/catalog/programs", params={"cursor": cursors[i % len(cursors)]}
+                                   if cursors[i % len(cursors)] else {}),
+                args.requests, args.concurrency,
+            ),
+            "program_detail": run_scenario(
+                client, "program detail", "/catalog/programs/{program_id}",
+                lambda c, i: c.get(f"/catalog/programs/{targets[i]}"),
+                args.requests, args.concurrency,
+            ),
+            "add_lesson": run_scenario(
+                client, "add lesson", "/cms/programs/{program_id}/lessons",
+                lambda c, i: c.post(
+                    f"/cms/programs/{targets[i]}/lessons",
+                    json={"title": f"Bench lesson {i}", "content_url": "https://cdn.demo/bench.mp4"},
+                    headers=auth,
+                ),
+                args.requests, args.concurrency,
+            ),
+        }
+        scenarios["worker_cycle"] = worker_cycles(args.worker_cycles, args.worker_lessons)
+    finally:
+        if process:
+            client.close()
+            process.terminate()
+            process.wait()
+        else:
+            client.__exit__(None, None, None)
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "driver": driver,
+        "database": args.database_url.split(":", 1)[0],
+        "python": platform.python_version(),
+        "config": {
+            "programs": args.programs,
+            "lessons_per_program": args.lessons_per_program,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "catalog_cache_ttl_seconds": float(os.environ["CATALOG_CACHE_TTL_SECONDS"]),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///bench.db"),
+                        help="database to seed and test (default: DATABASE_URL or sqlite:///bench.db)")
+    parser.add_argument("--programs", type=int, default=200)
+    parser.add_argument("--lessons-per-program", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="requests per HTTP scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per scenario")
+    parser.add_argument("--worker-cycles", type=int, default=5)
+    parser.add_argument("--worker-lessons", type=int, default=500, help="due lessons per worker cycle")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="CATALOG_CACHE_TTL_SECONDS for the app (default 0: measure uncached reads)")
+    parser.add_argument("--uvicorn", action="store_true", help="drive a local uvicorn instead of in-process")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for request targets")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    # Configure the app before it is imported (also inherited by the uvicorn child)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["CATALOG_CACHE_TTL_SECONDS"] = str(args.cache_ttl)
+    os.environ["EMBEDDED_WORKER"] = "false"
+    os.environ["SEED_DEMO_USERS"] = "true"
+    os.environ.setdefault("JWT_SECRET_KEY", secrets.token_urlsafe(32))
+
+    results = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, datetime.utcnow().strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[Bench] Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Serialization cost per 1,000 lessons: jsonable_encoder + json vs response models / orjson.
+
+    cd backend && python -m benchmarks.serialization [--lessons 1000] [--repeat 20]
+
+Lessons are built in memory (no database rows needed).
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from app.models_program import ContentTypeEnum, Lesson, StatusEnum, gen_uuid  # noqa: E402
+from app.responses import ORJSONResponse  # noqa: E402
+from app.schemas import LessonOut  # noqa: E402
+
+
+def make_lessons(count):
+    program_id, term_id, now = gen_uuid(), gen_uuid(), datetime.utcnow()
+    return [
+        Lesson(
+            id=gen_uuid(),
+            program_id=program_id,
+            term_id=term_id,
+            lesson_number=n,
+            title=f"Lesson {n}",
+            content_type=ContentTypeEnum.video,
+            duration_ms=600_000,
+            is_paid=False,
+            content_language_primary="en",
+            content_languages_available=["en", "hi"],
+            content_urls_by_language={"en": f"https://cdn.demo/{n}_en.mp4", "hi": f"https://cdn.demo/{n}_hi.mp4"},
+            subtitle_languages=["en"],
+            subtitle_urls_by_language={"en": f"https://cdn.demo/{n}_en.vtt"},
+            assets={},
+            status=StatusEnum.published,
+            published_at=now,
+            created_at=now,
+            updated_at=now,
+            thumbnail_assets_by_language={
+                "en": {"portrait": f"https://cdn.demo/{n}_p.jpg", "landscape": f"https://cdn.demo/{n}_l.jpg"}
+            },
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+def best_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lessons", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    lessons = make_lessons(args.lessons)
+    adapter = TypeAdapter(list[LessonOut])
+    encoded = jsonable_encoder(lessons)
+    cases = {
+        # What FastAPI did for routes without a response model
+        "jsonable_encoder + json.dumps": lambda: json.dumps(jsonable_encoder(lessons)).encode(),
+        # Response-model route: validate from attributes, dump in pydantic-core
+        "LessonOut from_attributes + dump_json": lambda: adapter.dump_json(adapter.validate_python(lessons)),
+        # Prebuilt dicts (catalog projection payloads)
+        "dicts: json.dumps": lambda: json.dumps(encoded).encode(),
+        "dicts: ORJSONResponse.render": lambda: ORJSONResponse(encoded).body,
+    }
+    per_thousand = 1000 / args.lessons
+    print(f"{args.lessons} lessons, best of {args.repeat} (ms per 1,000 lessons)")
+    for name, fn in cases.items():
+        print(f"  {name:<40} {best_ms(fn, args.repeat) * per_thousand:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,20 @@
-from datetime import datetime, timedelta, UTC
-from app.database import SessionLocal, engine, Base
+"""Demo (and optional synthetic) catalog data.
+
+    python seed_data.py [--synthetic 10000] [--lessons-per-program 50]
+
+seed() is idempotent: every row has a deterministic id (uuid5) and is written
+with INSERT ... ON CONFLICT DO NOTHING, a few set-based statements per table,
+so re-running it only adds what is missing.
+"""
+import argparse
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.catalog_projection import rebuild_catalog
+from app.database import SessionLocal
+from app.migrations import run_migrations
 from app.models_program import (
     Program,
     Term,
@@ -12,224 +27,254 @@ from app.models_program import (
     AssetTypeEnum,
 )
 
-# --- Ensure tables exist ---
-Base.metadata.create_all(bind=engine)
+# Insert order (parents first)
+SEED_TABLES = (Program, Term, Lesson, ProgramAsset, LessonAsset)
+SEED_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "lessoncms/seed")
+# Rows per INSERT statement
+SEED_CHUNK_SIZE = 5000
+# Synthetic programs generated (and committed) per batch
+SYNTHETIC_BATCH_SIZE = 100
+SYNTHETIC_LESSONS_PER_PROGRAM = 20
 
-db = SessionLocal()
 
-print(" Checking existing programs in database...")
+def seed_id(*key):
+    """Stable id for a seeded row, so re-runs hit ON CONFLICT instead of duplicating."""
+    return str(uuid.uuid5(SEED_NAMESPACE, ":".join(str(part) for part in key)))
 
-# -------------------------------------------------------------------
-#  Insert only if specific demo programs are missing
-# -------------------------------------------------------------------
-existing_titles = {p.title for p in db.query(Program).all()}
 
-programs_to_add = []
+def _slug(title):
+    return title.replace(" ", "_").lower()
 
-if "Python Basics" not in existing_titles:
-    programs_to_add.append(
-        Program(
-            title="Python Basics",
-            description="Learn Python programming from scratch.",
-            language_primary="en",
-            languages_available=["en", "hi"],
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
-        )
-    )
 
-if "Advanced React" not in existing_titles:
-    programs_to_add.append(
-        Program(
-            title="Advanced React",
-            description="Deep dive into React components, hooks, and performance.",
-            language_primary="en",
-            languages_available=["en"],
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
-        )
+# ---------- Row builders ----------
+# Each returns {model: [row dicts]} for one program and everything under it.
+def _program_bundle(key, program, lessons, now):
+    program = dict(program)
+    term_title = program.pop("term_title", "Term 1")
+    program_id = seed_id("program", key)
+    term_id = seed_id("term", key, 1)
+    bundle = {model: [] for model in SEED_TABLES}
+    bundle[Program].append({
+        "id": program_id,
+        "language_primary": "en",
+        "status": StatusEnum.published,
+        "published_at": now,
+        "created_at": now,
+        "updated_at": now,
+        "poster_assets_by_language": {},
+        **program,
+    })
+    bundle[Term].append({
+        "id": term_id,
+        "program_id": program_id,
+        "term_number": 1,
+        "title": term_title,
+        "created_at": now,
+        "next_lesson_number": len(lessons) + 1,
+    })
+    bundle[ProgramAsset].extend(
+        {
+            "id": seed_id("program_asset", key, variant.value),
+            "program_id": program_id,
+            "language": "en",
+            "variant": variant,
+            "asset_type": AssetTypeEnum.poster,
+            "url": f"https://cdn.demo/assets/{_slug(program['title'])}_poster_{variant.value}_en.jpg",
+        }
+        for variant in (AssetVariantEnum.portrait, AssetVariantEnum.landscape)
     )
+    for number, lesson in enumerate(lessons, 1):
+        lesson_id = seed_id("lesson", key, number)
+        bundle[Lesson].append({
+            "id": lesson_id,
+            "program_id": program_id,
+            "term_id": term_id,
+            "lesson_number": number,
+            "content_type": ContentTypeEnum.video,
+            "duration_ms": None,
+            "is_paid": False,
+            "content_language_primary": "en",
+            "content_languages_available": ["en"],
+            "content_urls_by_language": {},
+            "subtitle_languages": [],
+            "subtitle_urls_by_language": {},
+            "assets": {},
+            "status": StatusEnum.published,
+            "publish_at": None,
+            "published_at": now,
+            "created_at": now,
+            "updated_at": now,
+            "thumbnail_assets_by_language": {},
+            **lesson,
+        })
+        bundle[LessonAsset].extend(
+            {
+                "id": seed_id("lesson_asset", key, number, variant.value),
+                "lesson_id": lesson_id,
+                "language": "en",
+                "variant": variant,
+                "asset_type": AssetTypeEnum.thumbnail,
+                "url": f"https://cdn.demo/thumbnails/{lesson['title'].replace(' ', '_')}_{variant.value}.jpg",
+            }
+            for variant in (AssetVariantEnum.portrait, AssetVariantEnum.landscape)
+        )
+    return bundle
 
-if programs_to_add:
-    db.add_all(programs_to_add)
-    db.commit()
-    print(f" Added {len(programs_to_add)} missing demo programs.")
-else:
-    print(" All demo programs already exist, skipping program insert.")
-
-# Fetch programs again
-program_python = db.query(Program).filter_by(title="Python Basics").first()
-program_react = db.query(Program).filter_by(title="Advanced React").first()
-
-# -------------------------------------------------------------------
-#  TERMS
-# -------------------------------------------------------------------
-if program_python:
-    term1 = (
-        db.query(Term)
-        .filter_by(program_id=program_python.id, term_number=1)
-        .first()
-        or Term(program_id=program_python.id, term_number=1, title="Fundamentals")
-    )
-    db.add(term1)
-
-if program_react:
-    term2 = (
-        db.query(Term)
-        .filter_by(program_id=program_react.id, term_number=1)
-        .first()
-        or Term(program_id=program_react.id, term_number=1, title="Hooks & Optimization")
-    )
-    db.add(term2)
-
-db.commit()
-
-# -------------------------------------------------------------------
-#  LESSONS
-# -------------------------------------------------------------------
-lessons_to_add = []
-
-if program_python and not db.query(Lesson).filter_by(program_id=program_python.id).first():
-    lessons_to_add.extend([
-        Lesson(
-            program_id=program_python.id,
-            term_id=term1.id,
-            lesson_number=1,
-            title="Intro to Python",
-            content_type=ContentTypeEnum.video,
-            duration_ms=300000,
-            content_language_primary="en",
-            content_languages_available=["en", "hi"],
-            content_urls_by_language={
-                "en": "https://cdn.demo/python_intro_en.mp4",
-                "hi": "https://cdn.demo/python_intro_hi.mp4",
+
+def demo_bundles(now):
+    """The two demo programs; one React lesson is scheduled a few minutes out (worker demo)."""
+    return [
+        _program_bundle(
+            "python-basics",
+            {
+                "title": "Python Basics",
+                "description": "Learn Python programming from scratch.",
+                "languages_available": ["en", "hi"],
+                "term_title": "Fundamentals",
             },
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
-        ),
-        Lesson(
-            program_id=program_python.id,
-            term_id=term1.id,
-            lesson_number=2,
-            title="Data Types and Variables",
-            content_type=ContentTypeEnum.video,
-            duration_ms=450000,
-            content_language_primary="en",
-            content_languages_available=["en"],
-            content_urls_by_language={"en": "https://cdn.demo/python_datatypes_en.mp4"},
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
-        ),
-        Lesson(
-            program_id=program_python.id,
-            term_id=term1.id,
-            lesson_number=3,
-            title="Control Flow",
-            content_type=ContentTypeEnum.article,
-            content_language_primary="en",
-            content_languages_available=["en"],
-            content_urls_by_language={"en": "https://cdn.demo/python_controlflow.html"},
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
-        ),
-    ])
-
-if program_react and not db.query(Lesson).filter_by(program_id=program_react.id).first():
-    lessons_to_add.extend([
-        Lesson(
-            program_id=program_react.id,
-            term_id=term2.id,
-            lesson_number=1,
-            title="React Hooks Deep Dive",
-            content_type=ContentTypeEnum.video,
-            content_language_primary="en",
-            content_languages_available=["en"],
-            content_urls_by_language={"en": "https://cdn.demo/react_hooks.mp4"},
-            status=StatusEnum.published,
-            published_at=datetime.now(UTC),
+            [
+                {
+                    "title": "Intro to Python",
+                    "duration_ms": 300000,
+                    "content_languages_available": ["en", "hi"],
+                    "content_urls_by_language": {
+                        "en": "https://cdn.demo/python_intro_en.mp4",
+                        "hi": "https://cdn.demo/python_intro_hi.mp4",
+                    },
+                },
+                {
+                    "title": "Data Types and Variables",
+                    "duration_ms": 450000,
+                    "content_urls_by_language": {"en": "https://cdn.demo/python_datatypes_en.mp4"},
+                },
+                {
+                    "title": "Control Flow",
+                    "content_type": ContentTypeEnum.article,
+                    "content_urls_by_language": {"en": "https://cdn.demo/python_controlflow.html"},
+                },
+            ],
+            now,
         ),
-        Lesson(
-            program_id=program_react.id,
-            term_id=term2.id,
-            lesson_number=2,
-            title="Optimizing React Apps",
-            content_type=ContentTypeEnum.video,
-            content_language_primary="en",
-            content_languages_available=["en"],
-            content_urls_by_language={"en": "https://cdn.demo/react_optimize.mp4"},
-            status=StatusEnum.scheduled,
-            publish_at=datetime.now(UTC) + timedelta(minutes=2),
+        _program_bundle(
+            "advanced-react",
+            {
+                "title": "Advanced React",
+                "description": "Deep dive into React components, hooks, and performance.",
+                "languages_available": ["en"],
+                "term_title": "Hooks & Optimization",
+            },
+            [
+                {
+                    "title": "React Hooks Deep Dive",
+                    "content_urls_by_language": {"en": "https://cdn.demo/react_hooks.mp4"},
+                },
+                {
+                    "title": "Optimizing React Apps",
+                    "content_urls_by_language": {"en": "https://cdn.demo/react_optimize.mp4"},
+                    "status": StatusEnum.scheduled,
+                    "publish_at": now + timedelta(minutes=2),
+                    "published_at": None,
+                },
+            ],
+            now,
         ),
-    ])
+    ]
 
-if lessons_to_add:
-    db.add_all(lessons_to_add)
-    db.commit()
-    print(f" Added {len(lessons_to_add)} lessons.")
-else:
-    print(" Lessons already exist for demo programs, skipping.")
-
-# -------------------------------------------------------------------
-#  ASSETS
-# -------------------------------------------------------------------
-assets = []
-for program in [program_python, program_react]:
-    if program:
-        assets += [
-            ProgramAsset(
-                program_id=program.id,
-                language="en",
-                variant=AssetVariantEnum.portrait,
-                asset_type=AssetTypeEnum.poster,
-                url=f"https://cdn.demo/assets/{program.title.replace(' ', '_').lower()}_poster_portrait_en.jpg",
-            ),
-            ProgramAsset(
-                program_id=program.id,
-                language="en",
-                variant=AssetVariantEnum.landscape,
-                asset_type=AssetTypeEnum.poster,
-                url=f"https://cdn.demo/assets/{program.title.replace(' ', '_').lower()}_poster_landscape_en.jpg",
-            ),
-        ]
-
-if lessons_to_add:
-    for lesson in lessons_to_add:
-        assets.extend([
-            LessonAsset(
-                lesson_id=lesson.id,
-                language=lesson.content_language_primary,
-                variant=AssetVariantEnum.portrait,
-                asset_type=AssetTypeEnum.thumbnail,
-                url=f"https://cdn.demo/thumbnails/{lesson.title.replace(' ', '_')}_portrait.jpg",
-            ),
-            LessonAsset(
-                lesson_id=lesson.id,
-                language=lesson.content_language_primary,
-                variant=AssetVariantEnum.landscape,
-                asset_type=AssetTypeEnum.thumbnail,
-                url=f"https://cdn.demo/thumbnails/{lesson.title.replace(' ', '_')}_landscape.jpg",
-            ),
-        ])
-
-if assets:
-    db.add_all(assets)
-    db.commit()
-    print(f" Added {len(assets)} assets.")
-else:
-    print(" Assets already exist, skipping.")
-
-print("\n Seed completed successfully!")
-print(f"Programs now in DB: {[p.title for p in db.query(Program).all()]}")
-db.close()
-
-def main():
-    """Allows other scripts (like main.py) to call the seeder directly."""
-    # Just re-run this same file’s logic
-    from seed_data import (
-        Base, engine, SessionLocal, Program, Term, Lesson, ProgramAsset, LessonAsset,
-        StatusEnum, ContentTypeEnum, AssetVariantEnum, AssetTypeEnum
+
+def synthetic_bundle(n, lessons_per_program, now):
+    """Published program number `n` with `lessons_per_program` published lessons (load testing)."""
+    languages = ["en", "hi"] if n % 2 else ["en"]
+    return _program_bundle(
+        f"synthetic-{n}",
+        {
+            "title": f"Synthetic program {n}",
+            "description": f"Synthetic catalog program number {n} for load testing.",
+            "languages_available": languages,
+            # Distinct listing positions
+            "published_at": now - timedelta(seconds=n),
+        },
+        [
+            {
+                "title": f"Lesson {number} of program {n}",
+                "duration_ms": 600_000,
+                "content_languages_available": languages,
+                "content_urls_by_language": {
+                    lang: f"https://cdn.demo/synthetic/{n}/{number}_{lang}.mp4" for lang in languages
+                },
+                "subtitle_languages": ["en"],
+                "subtitle_urls_by_language": {"en": f"https://cdn.demo/synthetic/{n}/{number}_en.vtt"},
+            }
+            for number in range(1, lessons_per_program + 1)
+        ],
+        now,
     )
-    # Nothing else needed — Python will just re-import and execute above logic
+
+
+# ---------- Writing ----------
+def _insert_ignore(db, model, rows):
+    """INSERT ... ON CONFLICT DO NOTHING, in chunks."""
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        db.execute(insert(model.__table__).on_conflict_do_nothing(), rows[start:start + SEED_CHUNK_SIZE])
+
+
+def _write(db, bundles):
+    for model in SEED_TABLES:
+        rows = [row for bundle in bundles for row in bundle[model]]
+        if rows:
+            _insert_ignore(db, model, rows)
+    db.commit()
+
+
+def _row_counts(db):
+    return {
+        "programs": db.execute(select(func.count(Program.id))).scalar(),
+        "lessons": db.execute(select(func.count(Lesson.id))).scalar(),
+    }
+
+
+def seed(db, synthetic_programs=0, lessons_per_program=SYNTHETIC_LESSONS_PER_PROGRAM):
+    """Insert the demo programs and `synthetic_programs` generated ones; returns rows added.
+
+    Expects a migrated schema. The catalog projection is rebuilt only when
+    something was added.
+    """
+    now = datetime.utcnow()
+    before = _row_counts(db)
+
+    # Databases seeded before ids were deterministic already hold the demo
+    # programs under random ids; don't add them a second time.
+    bundles = demo_bundles(now)
+    existing_titles = set(db.execute(
+        select(Program.title).where(Program.title.in_([b[Program][0]["title"] for b in bundles]))
+    ).scalars())
+    _write(db, [b for b in bundles if b[Program][0]["title"] not in existing_titles])
+
+    for first in range(0, synthetic_programs, SYNTHETIC_BATCH_SIZE):
+        last = min(first + SYNTHETIC_BATCH_SIZE, synthetic_programs)
+        _write(db, [synthetic_bundle(n, lessons_per_program, now) for n in range(first, last)])
+
+    after = _row_counts(db)
+    added = {table: after[table] - before[table] for table in after}
+    if any(added.values()):
+        # Seeded rows bypass the publish paths; re-project the catalog from scratch
+        rebuild_catalog(db)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed demo (and synthetic) catalog data")
+    parser.add_argument("--synthetic", type=int, default=0, help="generated programs to add (load testing)")
+    parser.add_argument("--lessons-per-program", type=int, default=SYNTHETIC_LESSONS_PER_PROGRAM)
+    args = parser.parse_args(argv)
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        added = seed(db, args.synthetic, args.lessons_per_program)
+        print(f" Seed completed: added {added['programs']} programs, {added['lessons']} lessons.")
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# app.database reads DATABASE_URL at import time; point it at a throwaway SQLite file
+_db_dir = tempfile.mkdtemp(prefix="cms-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["DB_ASYNC"] = "false"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models_program import (  # noqa: E402
+    AssetTypeEnum, AssetVariantEnum, Lesson, LessonAsset, Program, ProgramAsset, Term,
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    run_migrations()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def count_queries():
+    """`with count_queries() as queries:` collects every SQL statement sent on the engine."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def make_program():
+    """`make_program(db, terms, lessons_per_term, languages=("en",))` -> id of a draft program.
+
+    Every lesson has a content URL and both thumbnails, so it can be published.
+    """
+
+    def factory(db, terms, lessons_per_term, languages=("en",)):
+        program = Program(
+            title=f"{terms}x{lessons_per_term}", language_primary=languages[0], languages_available=list(languages)
+        )
+        db.add(program)
+        db.flush()
+        db.add(ProgramAsset(
+            program_id=program.id, language=languages[0], asset_type=AssetTypeEnum.poster,
+            variant=AssetVariantEnum.portrait, url="https://img/poster.jpg",
+        ))
+        for term_number in range(1, terms + 1):
+            term = Term(program_id=program.id, term_number=term_number)
+            db.add(term)
+            db.flush()
+            for lesson_number in range(1, lessons_per_term + 1):
+                lesson = Lesson(
+                    program_id=program.id, term_id=term.id, lesson_number=lesson_number,
+                    title=f"Lesson {lesson_number}",
+                    content_urls_by_language={language: f"https://v/{language}" for language in languages},
+                )
+                db.add(lesson)
+                db.flush()
+                for variant in (AssetVariantEnum.portrait, AssetVariantEnum.landscape):
+                    db.add(LessonAsset(
+                        lesson_id=lesson.id, language=languages[0], asset_type=AssetTypeEnum.thumbnail,
+                        variant=variant, url=f"https://img/{lesson.id}/{variant.value}.jpg",
+                    ))
+        db.commit()
+        return program.id
+
+    return factory
@@ -0,0 +1,41 @@
+# backend/tests/test_cache.py
+from app.cache import TTLCache
+
+
+def test_set_after_invalidation_is_dropped():
+    cache = TTLCache()
+    generation = cache.generation
+    cache.invalidate_where(lambda key: True)  # a write committed while the value was loading
+    cache.set("k", "stale", generation)
+
+    assert cache.get("k") is None
+    assert cache.stats()["stale_sets"] == 1
+
+
+def test_set_without_invalidation_is_kept():
+    cache = TTLCache()
+    generation = cache.generation
+    cache.set("a", 1)
+    cache.set("k", "fresh", generation)
+
+    assert cache.get("k") == "fresh"
+
+
+def test_invalidation_reaches_publishers_and_remote_eviction(monkeypatch):
+    from app import cache, notify
+
+    sent = []
+    monkeypatch.setattr(cache, "invalidation_publishers", [lambda ids, listing: sent.append((ids, listing))])
+    cache.catalog_cache.set(("p1", None), "payload")
+    cache.catalog_cache.set((cache.CATALOG_LISTING, None), "listing")
+
+    cache.invalidate_catalog(["p1"], listing=True)
+    assert sent == [({"p1"}, True)]
+
+    # What another process does with the NOTIFY payload
+    cache.catalog_cache.set(("p2", None), "payload")
+    notify._evict('{"programs": ["p2"], "listing": false}')
+    assert cache.catalog_cache.get(("p2", None)) is None
+    cache.catalog_cache.set(("p3", None), "payload")
+    notify._evict('{"programs": null}')
+    assert cache.catalog_cache.get(("p3", None)) is None
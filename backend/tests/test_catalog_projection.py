@@ -0,0 +1,78 @@
+# backend/tests/test_catalog_projection.py
+from datetime import datetime
+
+from sqlalchemy import select, text
+
+from app.catalog_projection import refresh_lessons, refresh_programs
+from app.models_program import CatalogEntry, Lesson, Program, StatusEnum
+
+
+def _publish(db, program_id):
+    program = db.get(Program, program_id)
+    program.status = StatusEnum.published
+    program.published_at = datetime.utcnow()
+    for lesson in program.lessons:
+        lesson.status = StatusEnum.published
+    refresh_programs(db, [program_id])
+    db.commit()
+    return program
+
+
+def _entries(db, program_id):
+    rows = db.execute(
+        select(CatalogEntry.entry_id, CatalogEntry.language, CatalogEntry.position, CatalogEntry.payload)
+        .where(CatalogEntry.program_id == program_id)
+    ).all()
+    # updated_at is stamped at flush time, so it can differ by microseconds from the row
+    return {
+        (row.entry_id, row.language): (row.position, {k: v for k, v in row.payload.items() if k != "updated_at"})
+        for row in rows
+    }
+
+
+def _search_ids(db, program_id):
+    return set(db.execute(
+        text("SELECT entity_id FROM search_index WHERE rowid IN "
+             "(SELECT fts_rowid FROM search_index_rows WHERE program_id = :id)"),
+        {"id": program_id},
+    ).scalars())
+
+
+def test_refresh_lessons_matches_full_refresh(db, make_program):
+    program_id = make_program(db, 2, 3, languages=("en", "hi"))
+    program = _publish(db, program_id)
+    lessons = sorted(program.lessons, key=lambda lesson: (lesson.lesson_number, lesson.id))
+    program_row = db.execute(
+        select(CatalogEntry.refreshed_at).where(CatalogEntry.entry_id == program_id)
+    ).scalars().all()
+
+    archived, renamed = lessons[0], lessons[3]
+    archived.status = StatusEnum.archived
+    renamed.title = "Renamed"
+    written = refresh_lessons(db, [archived.id, renamed.id])
+    db.commit()
+    incremental, incremental_search = _entries(db, program_id), _search_ids(db, program_id)
+
+    assert written == 2  # the renamed lesson, in both languages
+    assert (archived.id, "en") not in incremental
+    assert incremental[(renamed.id, "hi")][1]["title"] == "Renamed"
+    assert archived.id not in incremental_search
+    # The program's own rows were not rewritten
+    assert db.execute(
+        select(CatalogEntry.refreshed_at).where(CatalogEntry.entry_id == program_id)
+    ).scalars().all() == program_row
+
+    refresh_programs(db, [program_id])
+    db.commit()
+    assert incremental == _entries(db, program_id)
+    assert incremental_search == _search_ids(db, program_id)
+
+
+def test_refresh_lessons_skips_unpublished_program(db, make_program):
+    program_id = make_program(db, 1, 2)
+    lesson = db.execute(select(Lesson).where(Lesson.program_id == program_id)).scalars().first()
+    lesson.status = StatusEnum.published
+
+    assert refresh_lessons(db, [lesson.id]) == 0
+    db.commit()
+    assert _entries(db, program_id) == {}
@@ -0,0 +1,24 @@
+# backend/tests/test_lesson_batch.py
+from sqlalchemy import delete, select
+
+from app.lesson_batch import SCHEDULE, apply_batch, schedule_time
+from app.models_program import Lesson, LessonAsset, StatusEnum
+
+
+def test_schedule_requires_thumbnails(db, make_program):
+    program_id = make_program(db, 1, 2)
+    ready, bare = db.execute(
+        select(Lesson).where(Lesson.program_id == program_id).order_by(Lesson.lesson_number)
+    ).scalars().all()
+    db.execute(delete(LessonAsset).where(LessonAsset.lesson_id == bare.id))
+    db.commit()
+
+    results, _ = apply_batch(db, SCHEDULE, ids=[ready.id, bare.id], publish_at=schedule_time())
+    db.commit()
+
+    by_id = {result["id"]: result for result in results}
+    assert by_id[ready.id]["ok"] and by_id[ready.id]["status"] == StatusEnum.scheduled
+    assert not by_id[bare.id]["ok"]
+    assert "thumbnail" in by_id[bare.id]["error"]
+    db.refresh(bare)
+    assert bare.status == StatusEnum.draft
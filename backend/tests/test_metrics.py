@@ -0,0 +1,27 @@
+# backend/tests/test_metrics.py
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.metrics import route_template
+
+
+def test_route_template_includes_router_prefix():
+    router = APIRouter()
+
+    @router.get("/programs/{program_id}")
+    def program(program_id: str, request: Request):
+        return route_template(request.scope)
+
+    @router.get("/health")
+    def health(request: Request):
+        return route_template(request.scope)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/catalog")
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.get("/catalog/programs/abc").json() == "/catalog/programs/{program_id}"
+    assert client.get("/programs/abc").json() == "/programs/{program_id}"
+    assert client.get("/health").json() == "/health"
+    assert route_template({"path": "/nope"}) == "unmatched"
@@ -0,0 +1,120 @@
+# backend/tests/test_notify.py
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app import notify
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.conn.executed.append(sql)
+
+
+class FakePsycopg2Connection:
+    """psycopg2's notification API over a pipe: readable while notifications are pending."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.notifies = []
+        self.executed = []
+        self.autocommit = False
+        self.closed = False
+        self._read, self._write = os.pipe()
+        os.write(self._write, b"x")
+
+    def fileno(self):
+        return self._read
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def poll(self):
+        os.read(self._read, 1)
+        if not self.batches:
+            raise ConnectionError("server closed the connection")
+        self.notifies.extend(SimpleNamespace(channel=c, payload=p) for c, p in self.batches.pop(0))
+        os.write(self._write, b"x")
+
+    def close(self):
+        self.closed = True
+        os.close(self._read)
+        os.close(self._write)
+
+
+def fake_engine(monkeypatch, driver, connections):
+    def raw_connection():
+        conn = connections.pop(0)
+        return SimpleNamespace(detach=lambda: None, driver_connection=conn)
+
+    engine = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql", driver=driver), raw_connection=raw_connection
+    )
+    monkeypatch.setattr(notify, "engine", engine)
+
+
+def test_listen_once_dispatches_until_connection_drops(monkeypatch):
+    conn = FakePsycopg2Connection([
+        [("boom", ""), ("catalog", '{"programs": ["p1"]}')],
+        [("schedule", "")],
+    ])
+    fake_engine(monkeypatch, "psycopg2", [conn])
+    received = []
+
+    def boom(payload):
+        raise ValueError("bad handler")
+
+    handlers = {
+        "boom": boom,
+        "catalog": lambda payload: received.append(("catalog", payload)),
+        "schedule": lambda payload: received.append(("schedule", payload)),
+    }
+    with pytest.raises(ConnectionError):
+        notify._listen_once(handlers)
+
+    assert conn.autocommit is True
+    assert conn.executed == ['LISTEN "boom"', 'LISTEN "catalog"', 'LISTEN "schedule"']
+    # A failing handler doesn't stop the others
+    assert received == [("catalog", '{"programs": ["p1"]}'), ("schedule", "")]
+    assert conn.closed
+
+
+class StopListening(BaseException):
+    pass
+
+
+def test_listen_reconnects_after_error(monkeypatch):
+    first, second = FakePsycopg2Connection([]), FakePsycopg2Connection([])
+    fake_engine(monkeypatch, "psycopg2", [first, second])
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            raise StopListening
+
+    monkeypatch.setattr(notify.time, "sleep", sleep)
+    with pytest.raises(StopListening):
+        notify._listen({"catalog": lambda payload: None})
+
+    assert first.closed and second.closed
+    assert sleeps == [notify.RECONNECT_SECONDS] * 2
+
+
+def test_listen_refuses_other_drivers(monkeypatch, capsys):
+    fake_engine(monkeypatch, "psycopg", [])
+
+    notify._listen({"catalog": lambda payload: None})  # returns instead of looping
+
+    assert "needs the psycopg2 driver" in capsys.readouterr().out
+    assert notify.start() is False
@@ -0,0 +1,25 @@
+# backend/tests/test_program_details.py
+import pytest
+
+from app.api.cms import _get_program_details
+from app.database import SessionLocal
+
+# The program, its assets, its terms, their lessons and the lessons' assets
+PROGRAM_DETAILS_QUERIES = 5
+
+
+@pytest.mark.parametrize("terms, lessons_per_term", [(1, 1), (2, 5), (4, 25)])
+def test_program_details_query_count_is_fixed(db, count_queries, make_program, terms, lessons_per_term):
+    program_id = make_program(db, terms, lessons_per_term)
+
+    # A fresh session, so nothing is served from the identity map
+    session = SessionLocal()
+    try:
+        with count_queries() as queries:
+            details = _get_program_details(session, program_id)
+    finally:
+        session.close()
+
+    assert len(details.terms) == terms
+    assert len(details.lessons) == terms * lessons_per_term
+    assert len(queries) == PROGRAM_DETAILS_QUERIES, queries
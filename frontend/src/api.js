@@ -10,9 +10,23 @@ const api = axios.create({
   baseURL: API_BASE_URL,
 });
 
+// List endpoints are paged: follow X-Next-Cursor until the last page
+export async function getAllPages(url, config = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const res = await api.get(url, {
+      ...config,
+      params: { ...config.params, include_total: false, ...(cursor && { cursor }) },
+    });
+    items.push(...res.data);
+    cursor = res.headers["x-next-cursor"];
+  } while (cursor);
+  return items;
+}
+
 export async function getPrograms() {
-  const res = await api.get("/catalog/programs");
-  return res.data;
+  return getAllPages("/catalog/programs");
 }
 
 export default api;
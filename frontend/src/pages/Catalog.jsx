@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import api from "../api";
+import api, { getPrograms } from "../api";
 
 export default function Catalog() {
   const [programs, setPrograms] = useState([]);
@@ -8,11 +8,15 @@ export default function Catalog() {
   const [selectedLanguage, setSelectedLanguage] = useState("en");
   const [loading, setLoading] = useState(false);
 
+  // /catalog/programs/:id returns { program, lessons }; the views read one flat object
+  function programView(data) {
+    return { ...data.program, lessons: data.lessons || [] };
+  }
+
   useEffect(() => {
     async function fetchPrograms() {
       try {
-        const res = await api.get("/catalog/programs");
-        setPrograms(res.data);
+        setPrograms(await getPrograms());
       } catch (err) {
         console.error("Failed to load catalog:", err);
       }
@@ -24,7 +28,7 @@ export default function Catalog() {
     setLoading(true);
     try {
       const res = await api.get(`/catalog/programs/${id}`);
-      setSelectedProgram(res.data);
+      setSelectedProgram(programView(res.data));
     } catch (err) {
       console.error("Failed to load program details:", err);
     } finally {
@@ -34,7 +38,22 @@ export default function Catalog() {
 
   function openLesson(lesson) {
     setSelectedLesson(lesson);
-    setSelectedLanguage(lesson.content_language_primary || "en");
+    setSelectedLanguage(lesson.language || lesson.content_language_primary || "en");
+  }
+
+  // Catalog payloads carry one language's URLs; switching refetches the program in that language
+  async function switchLanguage(lang) {
+    setSelectedLanguage(lang);
+    try {
+      const res = await api.get(`/catalog/programs/${selectedProgram.id}`, {
+        params: { lang },
+      });
+      setSelectedProgram(programView(res.data));
+      const lesson = res.data.lessons?.find((l) => l.id === selectedLesson.id);
+      if (lesson) setSelectedLesson(lesson);
+    } catch (err) {
+      console.error("Failed to load lesson language:", err);
+    }
   }
 
   function closeLesson() {
@@ -79,9 +98,9 @@ export default function Catalog() {
 
         {/* Program Header */}
         <div className="flex flex-col md:flex-row gap-8 mb-10 animate-fadeIn">
-          {selectedProgram.poster_assets_by_language?.en?.landscape && (
+          {selectedProgram.poster?.landscape && (
             <img
-              src={selectedProgram.poster_assets_by_language.en.landscape}
+              src={selectedProgram.poster.landscape}
               alt={selectedProgram.title}
               className="w-full md:w-1/3 rounded-lg shadow-2xl border border-slate-700 object-cover"
             />
@@ -121,8 +140,8 @@ export default function Catalog() {
                 <div className="relative">
                   <img
                     src={
-                      lesson.thumbnail_assets_by_language?.en?.landscape ||
-                      lesson.thumbnail_assets_by_language?.en?.portrait ||
+                      lesson.thumbnails?.landscape ||
+                      lesson.thumbnails?.portrait ||
                       "https://via.placeholder.com/400x225?text=No+Thumbnail"
                     }
                     alt={lesson.title}
@@ -182,7 +201,7 @@ export default function Catalog() {
                   {selectedLesson.content_languages_available.map((lang) => (
                     <button
                       key={lang}
-                      onClick={() => setSelectedLanguage(lang)}
+                      onClick={() => switchLanguage(lang)}
                       className={`px-3 py-1 rounded-lg text-sm font-semibold transition ${
                         lang === selectedLanguage
                           ? "bg-indigo-600 text-white"
@@ -197,24 +216,14 @@ export default function Catalog() {
 
               {selectedLesson.content_type === "article" ? (
                 <iframe
-                  src={
-                    selectedLesson.content_urls_by_language?.[selectedLanguage] ||
-                    selectedLesson.content_urls_by_language?.[
-                      selectedLesson.content_language_primary
-                    ]
-                  }
+                  src={selectedLesson.content_url}
                   title="Lesson Article"
                   className="w-full h-[70vh] rounded-lg border border-slate-700"
                 ></iframe>
               ) : (
                 <video
-                  key={selectedLanguage}
-                  src={
-                    selectedLesson.content_urls_by_language?.[selectedLanguage] ||
-                    selectedLesson.content_urls_by_language?.[
-                      selectedLesson.content_language_primary
-                    ]
-                  }
+                  key={selectedLesson.content_url}
+                  src={selectedLesson.content_url}
                   controls
                   className="w-full rounded-lg max-h-[75vh] object-contain border border-slate-700 shadow-md"
                 />
@@ -263,8 +272,8 @@ export default function Catalog() {
             >
               <img
                 src={
-                  p.poster_assets_by_language?.en?.portrait ||
-                  p.poster_assets_by_language?.en?.landscape ||
+                  p.poster?.portrait ||
+                  p.poster?.landscape ||
                   "https://via.placeholder.com/300x400?text=No+Poster"
                 }
                 alt={p.title}
@@ -1,5 +1,5 @@
 import { useState, useEffect } from "react";
-import api from "../api";
+import api, { getAllPages } from "../api";
 import { Link } from "react-router-dom";
 
 export default function Programs() {
@@ -12,8 +12,7 @@ export default function Programs() {
   useEffect(() => {
     async function fetchPrograms() {
       try {
-        const res = await api.get("/cms/programs");
-        setPrograms(res.data);
+        setPrograms(await getAllPages("/cms/programs"));
       } catch (err) {
         console.error(err);
       }